@@ -6,22 +6,27 @@ Interactive dashboard for managing AI tools, models, and system resources
 
 import os
 import sys
+import json
 import subprocess
 import shutil
+import platform
+import threading
+import time
+import importlib.util
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Optional, Dict, List, Tuple
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Dict, List, Tuple
 
+# readchar is imported where keys are read: it loads importlib.metadata,
+# which costs more than the rest of startup, so the menu paints first
 try:
     from rich.console import Console
     from rich.table import Table
     from rich.panel import Panel
-    from rich.layout import Layout
-    from rich.text import Text
     from rich.prompt import Prompt, Confirm
-    from rich.progress import Progress, SpinnerColumn, TextColumn
     from rich import box
-    import readchar
+    if importlib.util.find_spec("readchar") is None:
+        raise ImportError("No module named 'readchar'")
 except ImportError as e:
     print(f"Error: Missing library. Installing...")
     missing = str(e).split("'")[1] if "'" in str(e) else "rich readchar"
@@ -29,12 +34,8 @@ except ImportError as e:
     from rich.console import Console
     from rich.table import Table
     from rich.panel import Panel
-    from rich.layout import Layout
-    from rich.text import Text
     from rich.prompt import Prompt, Confirm
-    from rich.progress import Progress, SpinnerColumn, TextColumn
     from rich import box
-    import readchar
 
 console = Console()
 
@@ -44,6 +45,72 @@ CONFIGS_DIR = AI_HUB / "configs"
 WORKSPACES_DIR = AI_HUB / "workspaces"
 MODELS_DIR = AI_HUB / "models"
 SCRIPTS_DIR = AI_HUB / "scripts"
+PROMPT_LIBRARY_SCRIPT = SCRIPTS_DIR / "prompt-library.py"
+
+# Hardware probing
+PROBE_TIMEOUT = 3.0  # seconds an external probe (nvidia-smi, lscpu) may take
+VOLATILE_TTL = 5.0   # seconds before available RAM and free disk are re-read
+
+# Directory sizing
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "ai-hub"
+SIZE_CACHE_FILE = CACHE_DIR / "dir-sizes.json"
+SIZE_CACHE_VERSION = 2
+SIZE_WORKERS = min(32, (os.cpu_count() or 1) * 4)  # scandir is I/O bound
+
+# Model inspection
+CATALOG_DB = CACHE_DIR / "model-catalog.db"
+SAFETENSORS_MAX_HEADER = 100 * 1024 * 1024  # the format caps headers at 100MB
+MODEL_METADATA_MAX = 512  # longer metadata values (training tag counts...) are not kept
+# Tensor name prefixes of the parts of a checkpoint; anything else is the diffusion model
+MODEL_COMPONENT_PREFIXES = (
+    ("cond_stage_model.", "text_encoder"),
+    ("conditioner.", "text_encoder"),
+    ("text_encoders.", "text_encoder"),
+    ("first_stage_model.", "vae"),
+    ("vae.", "vae"),
+    ("encoder.", "vae"),
+    ("decoder.", "vae"),
+)
+
+# Requirements estimation. Rough figures for a UI using PyTorch SDPA
+# attention; activations scale with pixels x batch from the profile's
+# native resolution. extra_gb is what loads alongside a checkpoint that
+# does not carry its own text encoders (FLUX: T5-XXL + CLIP-L + VAE).
+ARCHITECTURE_PROFILES = {
+    "SD1.5": {"resolution": 512, "activation_gb": 0.6, "extra_gb": 0.0},
+    "SD2": {"resolution": 768, "activation_gb": 1.0, "extra_gb": 0.0},
+    "SDXL": {"resolution": 1024, "activation_gb": 1.5, "extra_gb": 0.0},
+    "FLUX": {"resolution": 1024, "activation_gb": 1.0, "extra_gb": 9.8},
+}
+# Models that can be checked before downloading: architecture, parameters, dtype
+DOWNLOADABLE_MODELS = {
+    "flux-dev": ("FLUX Dev", "FLUX", 11_900_000_000, "BF16"),
+    "flux-schnell": ("FLUX Schnell", "FLUX", 11_900_000_000, "BF16"),
+    "sdxl": ("SDXL", "SDXL", 3_470_000_000, "F16"),
+    "sd15": ("SD 1.5", "SD1.5", 1_070_000_000, "F16"),
+    "sd21": ("SD 2.1", "SD2", 1_300_000_000, "F16"),
+}
+DTYPE_BYTES = {"F64": 8, "F32": 4, "F16": 2, "BF16": 2, "F8_E4M3": 1, "F8_E5M2": 1, "I8": 1, "U8": 1}
+# none: everything on the GPU; model: one component on the GPU at a time;
+# sequential: layers streamed to the GPU as they run
+OFFLOAD_MODES = ("none", "model", "sequential")
+SEQUENTIAL_RESIDENT = 0.15  # share of the diffusion model on the GPU at once
+GPU_OVERHEAD_GB = 0.6       # CUDA context and allocator slack
+RAM_BASE_GB = 2.0           # the UI process itself
+
+# Duplicate models
+MODEL_EXTENSIONS = (".safetensors", ".ckpt", ".pt", ".pth", ".bin", ".gguf")
+DEDUP_MIN_SIZE = 1024 * 1024         # smaller files are not worth linking
+PARTIAL_HASH_BYTES = 1024 * 1024     # read from both the head and the tail
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+LINK_MODES = ("auto", "reflink", "hardlink", "symlink")
+# Model folders of other tools, mapped onto MODELS_DIR subdirectories
+MODEL_FOLDER_NAMES = {"Stable-diffusion": "checkpoints", "Lora": "loras", "VAE": "vae", "ESRGAN": "upscale_models"}
+
+# Live dashboard
+DASHBOARD_INTERVAL = 1.0     # seconds between samples, see AI_HUB_DASHBOARD_INTERVAL
+DASHBOARD_SIZE_REFRESH = 30.0  # seconds between hub size rescans
 
 # ASCII Art for each tool with brand colors
 TOOL_ASCII_ART = {
@@ -232,8 +299,17 @@ def get_active_theme() -> Dict[str, str]:
     # 3. Fallback to ANSI
     return THEMES["ansi"]
 
+class LazyTheme(dict):
+    """Active theme colors, detected on first lookup rather than at import"""
+
+    def __getitem__(self, key):
+        if not self:
+            self.update(get_active_theme())
+        return super().__getitem__(key)
+
+
 # Initialize theme
-THEME = get_active_theme()
+THEME = LazyTheme()
 
 
 @dataclass
@@ -257,75 +333,957 @@ class ModelRequirements:
     disk_gb: float
 
 
+def _read_text(path: Path) -> Optional[str]:
+    try:
+        return path.read_text()
+    except OSError:
+        return None
+
+
+def _run_probe(args: List[str]) -> Optional[str]:
+    """stdout of an external probe, or None if it is missing, fails or hangs"""
+    try:
+        result = subprocess.run(args, capture_output=True, text=True, timeout=PROBE_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def _meminfo_gb() -> Dict[str, float]:
+    """/proc/meminfo fields in GB"""
+    fields = {}
+    for line in (_read_text(Path("/proc/meminfo")) or "").splitlines():
+        key, _, value = line.partition(":")
+        parts = value.split()
+        if parts and parts[0].isdigit():
+            fields[key] = int(parts[0]) / (1024**2)  # kB
+    return fields
+
+
+class HardwareProbe:
+    """Hardware facts for the whole session
+
+    Static facts (CPU model, cores, total RAM, GPU and VRAM) are probed
+    once. /proc and /sys are read directly; the external probes that are
+    left (nvidia-smi, and lscpu where /proc/cpuinfo has no model name) run
+    concurrently in the background with a timeout, from the moment start()
+    is called. Available RAM and free disk are re-read after ttl seconds.
+    """
+
+    def __init__(self, disk_path: Path = AI_HUB, ttl: float = VOLATILE_TTL):
+        self.disk_path = disk_path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._pool = None
+        self._cpu = None
+        self._gpu = None
+        self._static = None
+        self._volatile = None
+        self._volatile_at = 0.0
+
+    def start(self):
+        """Begin the slow probes in the background; safe to call repeatedly"""
+        with self._lock:
+            if self._pool is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hw-probe")
+                self._cpu = self._pool.submit(self._probe_cpu)
+                self._gpu = self._pool.submit(self._probe_gpu)
+                self._pool.shutdown(wait=False)
+
+    @staticmethod
+    def _probe_cpu() -> str:
+        info = {}
+        for line in (_read_text(Path("/proc/cpuinfo")) or "").splitlines():
+            key, _, value = line.partition(":")
+            info.setdefault(key.strip(), value.strip())
+        # x86 has "model name"; ARM boards report "Model" or "Hardware"
+        for key in ("model name", "Model", "Hardware"):
+            if info.get(key):
+                return info[key]
+
+        for line in (_run_probe(["lscpu"]) or "").splitlines():
+            if line.startswith("Model name:"):
+                return line.split(":", 1)[1].strip()
+        return platform.processor() or "Unknown"
+
+    @staticmethod
+    def _probe_gpu() -> Tuple[Optional[str], Optional[float]]:
+        output = _run_probe(["nvidia-smi", "--query-gpu=name,memory.total", "--format=csv,noheader,nounits"])
+        if output:
+            name, _, total = output.splitlines()[0].partition(",")
+            try:
+                return name.strip(), float(total) / 1024
+            except ValueError:
+                pass
+
+        # amdgpu publishes VRAM size in sysfs, no external tool needed
+        for device in sorted(Path("/sys/class/drm").glob("card[0-9]*/device")):
+            total = _read_text(device / "mem_info_vram_total")
+            if total and total.strip().isdigit():
+                name = (_read_text(device / "product_name") or "").strip() or "AMD GPU"
+                return name, int(total) / (1024**3)
+        return None, None
+
+    def static(self) -> Dict:
+        """CPU, cores, total RAM, GPU and VRAM - probed once per session"""
+        self.start()
+        with self._lock:
+            if self._static is None:
+                ram_total = _meminfo_gb().get("MemTotal")
+                if ram_total is None:
+                    try:
+                        ram_total = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024**3)
+                    except (ValueError, OSError):
+                        ram_total = 0.0
+                gpu, vram_gb = self._gpu.result()
+                self._static = {
+                    "cpu": self._cpu.result(),
+                    "cpu_cores": os.cpu_count() or 0,
+                    "ram_total_gb": ram_total,
+                    "gpu": gpu,
+                    "vram_gb": vram_gb,
+                }
+            return self._static
+
+    def volatile(self) -> Dict:
+        """Available RAM and free disk, at most ttl seconds old"""
+        with self._lock:
+            now = time.monotonic()
+            if self._volatile is None or now - self._volatile_at > self.ttl:
+                try:
+                    disk_free_gb = shutil.disk_usage(self.disk_path).free / (1024**3)
+                except OSError:
+                    disk_free_gb = 0.0
+                self._volatile = {
+                    "ram_available_gb": _meminfo_gb().get("MemAvailable", 0.0),
+                    "disk_free_gb": disk_free_gb,
+                }
+                self._volatile_at = now
+            return self._volatile
+
+    def specs(self) -> SystemSpecs:
+        return SystemSpecs(**self.static(), **self.volatile())
+
+
+_hardware_probe = None
+
+
+def hardware_probe() -> HardwareProbe:
+    """Session-wide hardware probe"""
+    global _hardware_probe
+    if _hardware_probe is None:
+        _hardware_probe = HardwareProbe()
+    return _hardware_probe
+
+
 def get_system_specs() -> SystemSpecs:
-    """Gather system hardware information"""
+    """Gather system hardware information (cached, see HardwareProbe)"""
+    return hardware_probe().specs()
+
 
-    # CPU info
+def load_json_cache(cache_file: Path, version: int) -> Dict:
+    """Entries of a JSON cache file; empty if missing, corrupt or outdated"""
     try:
-        cpu_info = subprocess.run(
-            ["lscpu"], capture_output=True, text=True
-        ).stdout
-        cpu_name = [l for l in cpu_info.split('\n') if 'Model name' in l][0].split(':')[1].strip()
-        cpu_cores = int([l for l in cpu_info.split('\n') if 'CPU(s):' in l][0].split(':')[1].strip())
-    except:
-        cpu_name = "Unknown"
-        cpu_cores = os.cpu_count() or 0
-
-    # RAM info
+        data = json.loads(cache_file.read_text())
+        return data["entries"] if data.get("version") == version else {}
+    except (OSError, ValueError, KeyError, AttributeError):
+        return {}
+
+
+def save_json_cache(cache_file: Path, version: int, entries: Dict):
+    """Atomically replace a JSON cache file"""
     try:
-        mem_info = subprocess.run(
-            ["free", "-g"], capture_output=True, text=True
-        ).stdout.split('\n')[1].split()
-        ram_total = float(mem_info[1])
-        ram_available = float(mem_info[6])
-    except:
-        ram_total = 0.0
-        ram_available = 0.0
-
-    # GPU info (NVIDIA)
-    gpu_name = None
-    vram_gb = None
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": version, "entries": entries}, separators=(",", ":")))
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass  # a cache only saves time
+
+
+def _scan_dir(path: str, cached: Optional[list]) -> Optional[list]:
+    """[mtime_ns, own_bytes, linked, subdirs] of one directory
+
+    own_bytes is the directory entry itself plus its single-link files;
+    linked holds [dev, ino, size] of hardlinked files so they are counted
+    once per subtree. The cached entry is reused while the directory's
+    mtime is unchanged. None if the directory is gone.
+    """
     try:
-        nvidia_smi = subprocess.run(
-            ["nvidia-smi", "--query-gpu=name,memory.total", "--format=csv,noheader"],
-            capture_output=True, text=True
-        )
-        if nvidia_smi.returncode == 0:
-            gpu_info = nvidia_smi.stdout.strip().split(',')
-            gpu_name = gpu_info[0].strip()
-            vram_gb = float(gpu_info[1].strip().split()[0]) / 1024
-    except:
-        pass
+        st = os.stat(path)
+    except OSError:
+        return None
+    if cached is not None and cached[0] == st.st_mtime_ns:
+        return cached
 
-    # Disk space
+    own, linked, subdirs = st.st_size, [], []
     try:
-        disk_stat = shutil.disk_usage(AI_HUB)
-        disk_free_gb = disk_stat.free / (1024**3)
-    except:
-        disk_free_gb = 0.0
-
-    return SystemSpecs(
-        cpu=cpu_name,
-        cpu_cores=cpu_cores,
-        ram_total_gb=ram_total,
-        ram_available_gb=ram_available,
-        gpu=gpu_name,
-        vram_gb=vram_gb,
-        disk_free_gb=disk_free_gb
-    )
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                        continue
+                    entry_stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if entry_stat.st_nlink > 1:
+                    linked.append([entry_stat.st_dev, entry_stat.st_ino, entry_stat.st_size])
+                else:
+                    own += entry_stat.st_size
+    except OSError:
+        pass
+    return [st.st_mtime_ns, own, linked, subdirs]
+
+
+class DirSizer:
+    """Apparent directory sizes (what du -sb reports) without spawning du
+
+    One parallel os.scandir pass over a tree yields the total of every
+    directory in it, so subtotals never cost a second walk. Per-directory
+    results are cached on disk keyed on the directory's mtime: on a rescan
+    unchanged directories cost a single stat and only changed ones are
+    listed again. A file growing in place does not touch its directory's
+    mtime, so such a change shows up once the directory itself changes.
+    """
+
+    def __init__(self, cache_file: Path = SIZE_CACHE_FILE, workers: int = SIZE_WORKERS):
+        self.cache_file = cache_file
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._cache = None
+
+    def _load_cache(self) -> Dict[str, list]:
+        if self._cache is None:
+            self._cache = load_json_cache(self.cache_file, SIZE_CACHE_VERSION)
+        return self._cache
+
+    def _save_cache(self):
+        save_json_cache(self.cache_file, SIZE_CACHE_VERSION, self._cache)
+
+    def scan(self, root: Path) -> Dict[Path, int]:
+        """Total size in bytes of root and of every directory below it"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        root = os.path.abspath(root)
+        with self._lock:
+            cache = self._load_cache()
+
+        # Breadth-first, one level of directories at a time across the pool
+        nodes = {}
+        level = [root]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while level:
+                next_level = []
+                for path, node in zip(level, pool.map(lambda p: _scan_dir(p, cache.get(p)), level)):
+                    if node is not None:
+                        nodes[path] = node
+                        next_level.extend(os.path.join(path, name) for name in node[3])
+                level = next_level
+
+        # Keep the cache in step with the tree, dropping deleted directories
+        with self._lock:
+            prefix = root.rstrip(os.sep) + os.sep
+            stale = [p for p in cache if (p == root or p.startswith(prefix)) and p not in nodes]
+            changed = [p for p, node in nodes.items() if cache.get(p) is not node]
+            if stale or changed:
+                for path in stale:
+                    del cache[path]
+                for path in changed:
+                    cache[path] = nodes[path]
+                self._save_cache()
+
+        return {Path(p): total for p, total in _subtree_totals(nodes).items()}
+
+    def size(self, path: Path) -> int:
+        """Total size in bytes of one directory tree"""
+        return self.scan(path).get(Path(os.path.abspath(path)), 0)
+
+    def cached_size(self, path: Path) -> Optional[int]:
+        """Size of a tree as of its last scan, without touching the disk
+
+        None if the tree has not been scanned before.
+        """
+        root = os.path.abspath(path)
+        with self._lock:
+            cache = self._load_cache()
+            nodes = {}
+            level = [root] if root in cache else []
+            while level:
+                next_level = []
+                for path in level:
+                    node = cache.get(path)
+                    if node is not None:
+                        nodes[path] = node
+                        next_level.extend(os.path.join(path, name) for name in node[3])
+                level = next_level
+        return _subtree_totals(nodes)[root] if nodes else None
+
+
+def _subtree_totals(nodes: Dict[str, list]) -> Dict[str, int]:
+    """Total bytes under each directory of a breadth-first ordered tree"""
+    plain, linked = {}, {}
+    # Children come after their parents, so walk back up
+    for path in reversed(list(nodes)):
+        _, own, files, subdirs = nodes[path]
+        files = {(dev, ino): size for dev, ino, size in files}
+        for name in subdirs:
+            child = os.path.join(path, name)
+            if child in plain:
+                own += plain[child]
+                files.update(linked[child])
+        plain[path], linked[path] = own, files
+    return {path: plain[path] + sum(linked[path].values()) for path in nodes}
+
+
+_dir_sizer = None
+
+
+def dir_sizer() -> DirSizer:
+    """Session-wide directory sizer"""
+    global _dir_sizer
+    if _dir_sizer is None:
+        _dir_sizer = DirSizer()
+    return _dir_sizer
 
 
 def get_dir_size_gb(path: Path) -> float:
     """Get directory size in GB"""
+    return dir_sizer().size(path) / (1024**3)
+
+
+@dataclass
+class ModelInfo:
+    architecture: str
+    dtype: str
+    parameters: int
+    metadata: Dict[str, str]
+    components: Dict[str, int] = field(default_factory=dict)  # parameters per component
+
+
+def read_safetensors_header(path: Path) -> Dict:
+    """JSON header of a .safetensors file, read without touching the weights"""
+    import struct
+
+    with open(path, "rb") as f:
+        prefix = f.read(8)
+        if len(prefix) != 8:
+            raise ValueError("file too short for a safetensors header")
+        (length,) = struct.unpack("<Q", prefix)
+        if not 2 <= length <= SAFETENSORS_MAX_HEADER:
+            raise ValueError(f"implausible header length {length}")
+        header = f.read(length)
+    if len(header) != length:
+        raise ValueError("truncated safetensors header")
+    header = json.loads(header)
+    if not isinstance(header, dict):
+        raise ValueError("safetensors header is not an object")
+    return header
+
+
+def classify_model(tensor_names: List[str], metadata: Dict[str, str]) -> str:
+    """Architecture from tensor names, falling back to embedded metadata"""
+    def has(fragment: str) -> bool:
+        return any(fragment in name for name in tensor_names)
+
+    if has("lora_") or has(".lora.") or has("lora_A") or has("lora_B"):
+        base = metadata.get("ss_base_model_version", "").lower()
+        if "xl" in base or has("lora_te2_"):
+            return "LoRA (SDXL)"
+        if "flux" in base or has("double_blocks"):
+            return "LoRA (FLUX)"
+        if "v2" in base:
+            return "LoRA (SD2)"
+        return "LoRA (SD1.5)" if base.startswith("sd_v1") or has("lora_te_") else "LoRA"
+    if has("double_blocks.") or has("single_transformer_blocks."):
+        return "FLUX"
+    if has("conditioner.embedders.1.") or has("label_emb.0.0."):
+        return "SDXL"
+    if has("cond_stage_model.model.transformer."):
+        return "SD2"
+    if has("cond_stage_model.transformer.") or has("model.diffusion_model.input_blocks."):
+        return "SD1.5"
+    if has("decoder.conv_in.") and not has("model.diffusion_model."):
+        return "VAE"
+
+    architecture = metadata.get("modelspec.architecture", "").lower()
+    for fragment, name in (("flux", "FLUX"), ("xl", "SDXL"), ("v2", "SD2"), ("v1", "SD1.5")):
+        if fragment in architecture:
+            return name
+    return "Unknown"
+
+
+def model_component(tensor_name: str) -> str:
+    """Which part of a checkpoint a tensor belongs to"""
+    for prefix, component in MODEL_COMPONENT_PREFIXES:
+        if tensor_name.startswith(prefix):
+            return component
+    return "diffusion"
+
+
+def parse_model_info(header: Dict) -> ModelInfo:
+    """Architecture, dominant dtype, parameter counts and metadata of a header"""
+    metadata = header.get("__metadata__") or {}
+    dtype_params = {}
+    components = {}
+    parameters = 0
+    names = []
+    for name, tensor in header.items():
+        if name == "__metadata__" or not isinstance(tensor, dict):
+            continue
+        names.append(name)
+        count = 1
+        for dim in tensor.get("shape", ()):
+            count *= dim
+        parameters += count
+        dtype = tensor.get("dtype", "?")
+        dtype_params[dtype] = dtype_params.get(dtype, 0) + count
+        component = model_component(name)
+        components[component] = components.get(component, 0) + count
+
+    return ModelInfo(
+        architecture=classify_model(names, metadata),
+        dtype=max(dtype_params, key=dtype_params.get) if dtype_params else "?",
+        parameters=parameters,
+        metadata={k: str(v) for k, v in metadata.items() if len(str(v)) <= MODEL_METADATA_MAX},
+        components=components,
+    )
+
+
+def format_parameters(count: int) -> str:
+    """Parameter count as 860M / 2.6B"""
+    if count >= 1e9:
+        return f"{count / 1e9:.1f}B"
+    if count >= 1e6:
+        return f"{count / 1e6:.0f}M"
+    return f"{count / 1e3:.0f}K"
+
+
+def model_search_dirs() -> List[Path]:
+    """Directories scanned for duplicate models: the hub's and other tools'
+
+    Extra directories can be added with $AI_HUB_MODEL_DIRS (colon-separated).
+    """
+    dirs = [
+        MODELS_DIR,
+        AI_HUB / "stable-diffusion-webui" / "models",
+        Path.home() / "Projects" / "comfy" / "ComfyUI" / "models",
+    ]
+    dirs += [Path(d) for d in os.environ.get("AI_HUB_MODEL_DIRS", "").split(os.pathsep) if d]
+    return [d for d in dirs if d.is_dir()]
+
+
+@dataclass
+class DuplicateGroup:
+    size: int
+    digest: str
+    files: List[Path]
+    # (size, mtime_ns, inode) of each file as it was hashed
+    stats: Dict[Path, Tuple[int, int, int]] = field(default_factory=dict)
+
+    @property
+    def reclaimable(self) -> int:
+        return self.size * (len(self.files) - 1)
+
+
+def find_model_files(roots: List[Path], min_size: int = DEDUP_MIN_SIZE) -> Dict[Path, os.stat_result]:
+    """Regular model files under roots, one path per inode"""
+    files, seen = {}, set()
+    for root in roots:
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if not filename.lower().endswith(MODEL_EXTENSIONS):
+                    continue
+                path = Path(dirpath) / filename
+                try:
+                    st = path.lstat()
+                except OSError:
+                    continue
+                # Symlinks and extra hardlinks are already deduplicated
+                if path.is_symlink() or st.st_size < min_size or (st.st_dev, st.st_ino) in seen:
+                    continue
+                seen.add((st.st_dev, st.st_ino))
+                files[path] = st
+    return files
+
+
+def _fingerprint(st: os.stat_result) -> Tuple[int, int, int]:
+    """What must stay the same for a file's hash to still hold"""
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def partial_hash(path: Path, size: int) -> str:
+    """Hash of the first and last PARTIAL_HASH_BYTES of a file"""
+    import hashlib
+
+    digest = hashlib.blake2b(size.to_bytes(8, "little"))
+    with open(path, "rb") as f:
+        digest.update(f.read(PARTIAL_HASH_BYTES))
+        if size > PARTIAL_HASH_BYTES:
+            f.seek(max(PARTIAL_HASH_BYTES, size - PARTIAL_HASH_BYTES))
+            digest.update(f.read(PARTIAL_HASH_BYTES))
+    return digest.hexdigest()
+
+
+def _fadvise(fd: int, offset: int, length: int, advice: str):
+    """posix_fadvise where the platform has it; advice is the POSIX_FADV_ suffix"""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, offset, length, getattr(os, f"POSIX_FADV_{advice}"))
+        except OSError:
+            pass
+
+
+_mincore = None
+
+
+def resident_pages(fd: int, size: int) -> Optional[bytes]:
+    """mincore(2) of an open file: one byte per page, non-zero if cached
+
+    The file is mapped but never touched, so nothing is read. Returns None
+    where mmap/mincore cannot be called through libc.
+    """
+    global _mincore
+    import ctypes
+    import mmap
+
+    if _mincore is None:
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            libc.mmap.restype = ctypes.c_void_p
+            libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                  ctypes.c_long]
+            libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+            libc.mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p]
+            _mincore = libc
+        except (OSError, AttributeError):
+            _mincore = False
+    if not _mincore or size <= 0:
+        return None
+
+    address = _mincore.mmap(None, size, mmap.PROT_READ, mmap.MAP_SHARED, fd, 0)
+    if address in (None, ctypes.c_void_p(-1).value):
+        return None
     try:
-        result = subprocess.run(
-            ["du", "-sb", str(path)],
-            capture_output=True, text=True
-        )
-        bytes_size = int(result.stdout.split()[0])
-        return bytes_size / (1024**3)
-    except:
-        return 0.0
+        vec = (ctypes.c_ubyte * ((size + mmap.PAGESIZE - 1) // mmap.PAGESIZE))()
+        if _mincore.mincore(address, size, vec) != 0:
+            return None
+        return bytes(vec)
+    finally:
+        _mincore.munmap(address, size)
+
+
+def full_hash(path: Path, on_progress: Optional[Callable[[int], None]] = None,
+              stop: Optional[threading.Event] = None) -> Optional[str]:
+    """SHA256 of a whole file
+
+    The file is read with readinto into one page-aligned HASH_CHUNK_SIZE
+    buffer, so nothing is allocated per chunk, and hashlib drops the GIL
+    while digesting it, so several files hash on separate cores. The
+    kernel is told the read is sequential, and chunks that had no page
+    cached before hashing are dropped again once hashed, so hashing a
+    model library does not flush the page cache - nor evict models another
+    UI has loaded. Where residency cannot be checked nothing is dropped.
+    on_progress, if given, gets the byte count of each chunk. Returns None
+    if stop is set before the file is done.
+    """
+    import hashlib
+    import mmap
+
+    digest = hashlib.sha256()
+    buffer = mmap.mmap(-1, HASH_CHUNK_SIZE)  # anonymous mapping: page aligned
+    view = memoryview(buffer)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            fd = f.fileno()
+            resident = resident_pages(fd, os.fstat(fd).st_size)
+            _fadvise(fd, 0, 0, "SEQUENTIAL")
+            offset = 0
+            while True:
+                if stop is not None and stop.is_set():
+                    return None
+                n = f.readinto(view)
+                if not n:
+                    break
+                digest.update(view[:n])
+                first, last = offset // mmap.PAGESIZE, (offset + n + mmap.PAGESIZE - 1) // mmap.PAGESIZE
+                if resident is not None and resident.count(0, first, last) == last - first:
+                    _fadvise(fd, offset, n, "DONTNEED")
+                offset += n
+                if on_progress:
+                    on_progress(n)
+        return digest.hexdigest()
+    finally:
+        view.release()
+        buffer.close()
+
+
+def hash_files(paths: List[Path], on_progress: Optional[Callable[[int], None]] = None,
+               stop: Optional[threading.Event] = None, workers: int = HASH_WORKERS):
+    """Yield (path, sha256) as each file finishes, hashing several at once
+
+    The sha256 is None for files that could not be read. on_progress is
+    called from the worker threads with byte counts. Setting stop ends
+    the files in flight early and skips the rest.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash")
+    try:
+        futures = {pool.submit(full_hash, path, on_progress, stop): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                digest = future.result()
+            except OSError:
+                digest = None
+            if stop is not None and stop.is_set():
+                return
+            yield futures[future], digest
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _bucket(groups: List[List[Path]], keys: Dict[Path, str]) -> List[Tuple[str, List[Path]]]:
+    """Split each group by key, keeping only buckets of two or more"""
+    regrouped = []
+    for group in groups:
+        buckets = {}
+        for path in group:
+            if keys.get(path):
+                buckets.setdefault(keys[path], []).append(path)
+        regrouped += [(key, paths) for key, paths in buckets.items() if len(paths) > 1]
+    return regrouped
+
+
+def find_duplicates(roots: List[Path],
+                    on_progress: Optional[Callable[[str, int, int], None]] = None) -> List[DuplicateGroup]:
+    """Groups of identical model files under roots, largest savings first
+
+    Files are grouped by size, then by a head-and-tail partial hash, and
+    only files still sharing a group get a full SHA256, so unique models
+    are barely read. Hashing runs in parallel across files; on_progress,
+    if given, is called (possibly from worker threads) with
+    (stage, bytes done, bytes total).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    files = find_model_files(roots)
+    by_size = {}
+    for path, st in files.items():
+        by_size.setdefault(st.st_size, []).append(path)
+    candidates = [paths for paths in by_size.values() if len(paths) > 1]
+
+    def size_of(path: Path) -> int:
+        return files[path].st_size
+
+    def tracker(stage: str, total: int) -> Callable[[int], None]:
+        done, lock = 0, threading.Lock()
+
+        def advance(n: int):
+            nonlocal done
+            with lock:
+                done += n
+                if on_progress:
+                    on_progress(stage, done, total)
+        return advance
+
+    def partial_key(path: Path) -> Optional[str]:
+        try:
+            return partial_hash(path, size_of(path))
+        except OSError:
+            return None  # unreadable or removed mid-scan: never a duplicate
+        finally:
+            partial_progress(min(size_of(path), 2 * PARTIAL_HASH_BYTES))
+
+    paths = [path for group in candidates for path in group]
+    partial_progress = tracker("Partial hash", sum(min(size_of(path), 2 * PARTIAL_HASH_BYTES) for path in paths))
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        partial = _bucket(candidates, dict(zip(paths, pool.map(partial_key, paths))))
+
+    groups = [group for _, group in partial]
+    paths = [path for group in groups for path in group]
+    full_progress = tracker("Full hash", sum(size_of(path) for path in paths))
+    full = _bucket(groups, dict(hash_files(paths, full_progress)))
+
+    groups = [
+        DuplicateGroup(size_of(paths[0]), digest, sorted(paths), {path: _fingerprint(files[path]) for path in paths})
+        for digest, paths in full
+    ]
+    return sorted(groups, key=lambda group: group.reclaimable, reverse=True)
+
+
+def hub_model_path(path: Path) -> Path:
+    """Where a model from another tool's folder belongs in MODELS_DIR"""
+    folder = path.parent.name
+    return MODELS_DIR / MODEL_FOLDER_NAMES.get(folder, folder.lower()) / path.name
+
+
+def _reflink(source: Path, target: Path):
+    """Copy-on-write clone (FICLONE); raises OSError where unsupported"""
+    import fcntl
+
+    FICLONE = 0x40049409
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def _link(source: Path, target: Path, mode: str) -> str:
+    """Create target as a link to source; returns the mode actually used"""
+    same_device = source.stat().st_dev == target.parent.stat().st_dev
+    if mode in ("auto", "reflink") and same_device:
+        try:
+            _reflink(source, target)
+            return "reflink"
+        except OSError:
+            target.unlink(missing_ok=True)
+            if mode == "reflink":
+                raise
+    if mode in ("auto", "hardlink") and same_device:
+        os.link(source, target)
+        return "hardlink"
+    if mode in ("auto", "symlink"):
+        os.symlink(source.resolve(), target)
+        return "symlink"
+    raise OSError(f"cannot {mode} across filesystems")
+
+
+def consolidate_duplicates(groups: List[DuplicateGroup], mode: str = "auto") -> Tuple[int, List[str]]:
+    """Replace duplicates with links to one copy in MODELS_DIR
+
+    The copy kept is one already in MODELS_DIR, else another copy is
+    hardlinked into MODELS_DIR first (when on the same filesystem).
+    Each duplicate is swapped atomically for its link, and skipped if its
+    size, mtime or inode changed since it was hashed; a group whose kept
+    copy changed is skipped whole. Returns (bytes reclaimed, errors).
+    """
+    reclaimed, errors = 0, []
+    hub = MODELS_DIR.resolve()
+    for group in groups:
+        in_hub = [path for path in group.files if path.resolve().is_relative_to(hub)]
+        keeper = in_hub[0] if in_hub else group.files[0]
+        try:
+            if _fingerprint(keeper.lstat()) != group.stats.get(keeper):
+                errors.append(f"{keeper}: changed since hashing, skipped")
+                continue
+        except OSError as e:
+            errors.append(f"{keeper}: {e}")
+            continue
+        if not in_hub:
+            target = hub_model_path(keeper)
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if not target.exists() and keeper.stat().st_dev == target.parent.stat().st_dev:
+                    os.link(keeper, target)
+                    keeper = target
+            except OSError as e:
+                errors.append(f"{keeper}: {e}")
+
+        try:
+            keeper_stat = keeper.stat()
+        except OSError as e:
+            errors.append(f"{keeper}: {e}")
+            continue
+        for path in group.files:
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            try:
+                st = path.lstat()
+                if _fingerprint(st) != group.stats.get(path) or (st.st_dev, st.st_ino) == (keeper_stat.st_dev, keeper_stat.st_ino):
+                    continue  # changed since hashing, or the copy being kept
+                _link(keeper, tmp, mode)
+                os.replace(tmp, path)
+                reclaimed += group.size
+            except OSError as e:
+                tmp.unlink(missing_ok=True)
+                errors.append(f"{path}: {e}")
+    return reclaimed, errors
+
+
+@dataclass
+class CatalogEntry:
+    path: Path
+    folder: str
+    size: int
+    mtime_ns: int
+    sha256: Optional[str]
+    info: Optional[ModelInfo]
+
+    @property
+    def autov2(self) -> Optional[str]:
+        """civitai's AutoV2 hash: the first 10 hex digits of the SHA256"""
+        return self.sha256[:10].upper() if self.sha256 else None
+
+
+class ModelCatalog:
+    """Catalog of every model file under MODELS_DIR
+
+    A small SQLite database holding each file's size, mtime, inode,
+    parsed safetensors header and SHA256. A rescan stats every file but
+    only re-reads headers of new or changed ones, and clears their hash.
+    Hashes are computed by a background worker pool and committed one
+    file at a time, so an interrupted run picks up where it stopped.
+    """
+
+    SCHEMA_VERSION = 2
+
+    def __init__(self, db_path: Path = CATALOG_DB, root: Path = MODELS_DIR):
+        import sqlite3
+
+        self.root = root
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._hasher = None
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+            self._init_schema()
+        except (OSError, sqlite3.Error):
+            # Unwritable cache directory - keep the catalog for this session only
+            self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._init_schema()
+
+    def _init_schema(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS models")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS models (
+                path TEXT PRIMARY KEY,
+                folder TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                sha256 TEXT,
+                info TEXT
+            )
+        """)
+        self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def rescan(self) -> int:
+        """Bring the catalog in line with MODELS_DIR; returns entries changed"""
+        with self._lock:
+            known = {
+                row[0]: tuple(row[1:])
+                for row in self.conn.execute("SELECT path, size, mtime_ns, inode FROM models")
+            }
+            seen, changed = set(), []
+            for dirpath, dirnames, filenames in os.walk(self.root):
+                dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                for filename in filenames:
+                    if filename.startswith(".") or not filename.lower().endswith(MODEL_EXTENSIONS):
+                        continue
+                    path = Path(dirpath) / filename
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    rel = str(path.relative_to(self.root))
+                    seen.add(rel)
+                    if known.get(rel) != (st.st_size, st.st_mtime_ns, st.st_ino):
+                        changed.append((rel, path, st))
+
+            rows = []
+            for rel, path, st in changed:
+                info = None
+                if path.suffix.lower() == ".safetensors":
+                    try:
+                        info = json.dumps(parse_model_info(read_safetensors_header(path)).__dict__)
+                    except (OSError, ValueError, TypeError):
+                        pass
+                folder = rel.split(os.sep, 1)[0] if os.sep in rel else "."
+                rows.append((rel, folder, st.st_size, st.st_mtime_ns, st.st_ino, info))
+
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO models (path, folder, size, mtime_ns, inode, sha256, info) "
+                    "VALUES (?, ?, ?, ?, ?, NULL, ?)", rows
+                )
+                self.conn.executemany("DELETE FROM models WHERE path = ?", [(p,) for p in known.keys() - seen])
+            return len(rows) + len(known.keys() - seen)
+
+    def entries(self, folder: Optional[str] = None) -> List[CatalogEntry]:
+        """Catalogued models, by folder and name"""
+        query = "SELECT path, folder, size, mtime_ns, sha256, info FROM models"
+        params = ()
+        if folder is not None:
+            query += " WHERE folder = ?"
+            params = (folder,)
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY folder, path", params).fetchall()
+        return [
+            CatalogEntry(self.root / path, folder, size, mtime_ns, sha256, ModelInfo(**json.loads(info)) if info else None)
+            for path, folder, size, mtime_ns, sha256, info in rows
+        ]
+
+    def pending(self) -> int:
+        """Models still waiting for their hash"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM models WHERE sha256 IS NULL").fetchone()[0]
+
+    @property
+    def hashing(self) -> bool:
+        return self._hasher is not None and self._hasher.is_alive()
+
+    def start_hashing(self):
+        """Hash unhashed models in the background; no-op if already running"""
+        with self._lock:
+            if not self.hashing:
+                self._stop.clear()
+                self._hasher = threading.Thread(target=self._hash_pending, name="model-hasher", daemon=True)
+                self._hasher.start()
+
+    def stop_hashing(self):
+        """Stop after the files being hashed; the rest stay pending"""
+        self._stop.set()
+        if self._hasher:
+            self._hasher.join()
+
+    def _hash_pending(self):
+        with self._lock:
+            pending = {
+                self.root / row[0]: row
+                for row in self.conn.execute(
+                    "SELECT path, size, mtime_ns, inode FROM models WHERE sha256 IS NULL ORDER BY size"
+                )
+            }
+
+        for path, digest in hash_files(list(pending), stop=self._stop):
+            row = pending[path]
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            # Discard the hash of a file that changed while it was read
+            if digest and (st.st_size, st.st_mtime_ns, st.st_ino) == tuple(row[1:]):
+                with self._lock, self.conn:
+                    self.conn.execute(
+                        "UPDATE models SET sha256 = ? WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                        (digest, *row)
+                    )
+
+
+_model_catalog = None
+
+
+def model_catalog() -> ModelCatalog:
+    """Session-wide model catalog"""
+    global _model_catalog
+    if _model_catalog is None:
+        _model_catalog = ModelCatalog()
+    return _model_catalog
+
+
+AI_TOOLS = {
+    "claude": {"cmd": "claude", "workspace": "claude"},
+    "crush": {"cmd": "crush", "workspace": "crush"},
+    "gemini": {"cmd": "gemini", "workspace": "gemini"},
+    "ollama": {"cmd": "ollama", "workspace": "ollama"},
+    "lmstudio": {"cmd": "lmstudio", "workspace": "lmstudio"},
+    "qwen": {"cmd": "qwen", "workspace": "qwen"},
+    "opencode": {"cmd": "opencode", "workspace": "opencode"},
+}
 
 
 def check_tool_installed(tool: str) -> bool:
@@ -333,29 +1291,53 @@ def check_tool_installed(tool: str) -> bool:
     return shutil.which(tool) is not None
 
 
-def get_tool_status() -> Dict[str, Dict]:
-    """Get status of all AI tools"""
-    tools = {
-        "claude": {"cmd": "claude", "workspace": "claude"},
-        "crush": {"cmd": "crush", "workspace": "crush"},
-        "gemini": {"cmd": "gemini", "workspace": "gemini"},
-        "ollama": {"cmd": "ollama", "workspace": "ollama"},
-        "lmstudio": {"cmd": "lmstudio", "workspace": "lmstudio"},
-        "qwen": {"cmd": "qwen", "workspace": "qwen"},
-        "opencode": {"cmd": "opencode", "workspace": "opencode"},
+def _check_tool(name: str, info: Dict[str, str]) -> Dict[str, bool]:
+    launcher = SCRIPTS_DIR / f"launch-{name}.sh"
+    return {
+        "installed": check_tool_installed(info["cmd"]),
+        "launcher": launcher.is_file(),
+        "workspace": (WORKSPACES_DIR / info["workspace"]).is_dir(),
     }
 
-    status = {}
-    for name, info in tools.items():
-        launcher = SCRIPTS_DIR / f"launch-{name}.sh"
-        workspace = WORKSPACES_DIR / info["workspace"]
 
+def get_tool_status(on_update: Optional[Callable[[Dict[str, Dict]], None]] = None) -> Dict[str, Dict]:
+    """Get status of all AI tools
+
+    Tool checks and the workspace scan run concurrently. Until they finish
+    a field is None, except workspace_size, which starts from the last
+    scan's cached size. on_update, if given, is called with the status so
+    far first and again after each result lands.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    sizer = dir_sizer()
+    status = {}
+    for name, info in AI_TOOLS.items():
+        cached = sizer.cached_size(WORKSPACES_DIR / info["workspace"])
         status[name] = {
-            "installed": check_tool_installed(info["cmd"]),
-            "launcher": launcher.exists() and launcher.is_file(),
-            "workspace": workspace.exists() and workspace.is_dir(),
-            "workspace_size": get_dir_size_gb(workspace) if workspace.exists() else 0.0
+            "installed": None,
+            "launcher": None,
+            "workspace": None,
+            "workspace_size": cached / (1024**3) if cached is not None else None,
         }
+    if on_update:
+        on_update(status)
+
+    with ThreadPoolExecutor(max_workers=len(AI_TOOLS) + 1) as pool:
+        # One pass sizes every workspace
+        futures = {pool.submit(sizer.scan, WORKSPACES_DIR): None}
+        futures.update({pool.submit(_check_tool, name, info): name for name, info in AI_TOOLS.items()})
+
+        for future in as_completed(futures):
+            name = futures[future]
+            if name is None:
+                sizes = future.result()
+                for tool, info in AI_TOOLS.items():
+                    status[tool]["workspace_size"] = sizes.get(WORKSPACES_DIR / info["workspace"], 0) / (1024**3)
+            else:
+                status[name].update(future.result())
+            if on_update:
+                on_update(status)
 
     return status
 
@@ -393,7 +1375,7 @@ def display_system_info():
             f"{specs.vram_gb:.1f} GB VRAM {vram_status}"
         )
     else:
-        table.add_row("GPU", "No NVIDIA GPU detected", "❌ Not available")
+        table.add_row("GPU", "No GPU detected", "❌ Not available")
 
     # Disk
     disk_status = "✓ Good" if specs.disk_free_gb > 50 else "⚠ Low"
@@ -403,10 +1385,7 @@ def display_system_info():
     console.print()
 
 
-def display_tool_status():
-    """Display status of all AI tools"""
-    status = get_tool_status()
-
+def _tool_status_table(status: Dict[str, Dict]) -> Table:
     table = Table(title="AI Tools Status", box=box.ROUNDED)
     table.add_column("Tool", style="cyan", no_wrap=True)
     table.add_column("Installed", justify="center")
@@ -414,69 +1393,93 @@ def display_tool_status():
     table.add_column("Workspace", justify="center")
     table.add_column("Size", justify="right")
 
-    for name, info in sorted(status.items()):
-        installed = "✓" if info["installed"] else "✗"
-        launcher = "✓" if info["launcher"] else "✗"
-        workspace = "✓" if info["workspace"] else "✗"
-        size = f"{info['workspace_size']:.2f} GB" if info['workspace_size'] > 0 else "0 MB"
+    def mark(value: Optional[bool]) -> str:
+        if value is None:
+            return "[dim]…[/]"
+        return "[green]✓[/]" if value else "[red]✗[/]"
 
-        installed_style = "green" if info["installed"] else "red"
+    for name, info in sorted(status.items()):
+        size_gb = info["workspace_size"]
+        if size_gb is None:
+            size = "[dim]…[/]"
+        else:
+            size = f"{size_gb:.2f} GB" if size_gb > 0 else "0 MB"
 
         table.add_row(
             name.title(),
-            f"[{installed_style}]{installed}[/]",
-            f"[green]{launcher}[/]" if info["launcher"] else f"[red]{launcher}[/]",
-            f"[green]{workspace}[/]" if info["workspace"] else f"[red]{workspace}[/]",
+            mark(info["installed"]),
+            mark(info["launcher"]),
+            mark(info["workspace"]),
             size
         )
 
-    console.print(table)
+    return table
+
+
+def display_tool_status():
+    """Display status of all AI tools, filling in as the checks finish"""
+    from rich.live import Live
+
+    with Live(console=console, refresh_per_second=10) as live:
+        get_tool_status(on_update=lambda status: live.update(_tool_status_table(status)))
     console.print()
 
 
 def display_models():
     """Display information about AI models"""
-    models_path = MODELS_DIR / "checkpoints"
+    catalog = model_catalog()
+    catalog.rescan()
+    catalog.start_hashing()
+    entries = catalog.entries()
 
-    table = Table(title="AI Models (Checkpoints)", box=box.ROUNDED)
+    table = Table(title="AI Models", box=box.ROUNDED)
     table.add_column("Model", style="cyan")
     table.add_column("Size", justify="right")
     table.add_column("Type", style="yellow")
+    table.add_column("Precision")
+    table.add_column("Params", justify="right")
+    table.add_column("AutoV2", style="dim", no_wrap=True)
 
-    if models_path.exists():
+    if entries:
         total_size = 0.0
-        model_count = 0
-
-        for model_file in sorted(models_path.glob("*.safetensors")):
-            size_gb = model_file.stat().st_size / (1024**3)
+        folder = None
+        for entry in entries:
+            if entry.folder != folder:
+                folder = entry.folder
+                table.add_row(f"[bold]{folder}/[/]", "", "", "", "", "")
+            size_gb = entry.size / (1024**3)
             total_size += size_gb
-            model_count += 1
 
-            # Determine type
-            if "xl" in model_file.name.lower():
-                model_type = "SDXL"
-            elif "v1-5" in model_file.name.lower() or "v15" in model_file.name.lower():
-                model_type = "SD 1.5"
+            # Read from the safetensors header, not guessed from the name
+            info = entry.info
+            if info:
+                details = (info.architecture, info.dtype, format_parameters(info.parameters))
+            elif entry.path.suffix.lower() == ".safetensors":
+                details = ("[red]Unreadable[/]", "", "")
             else:
-                model_type = "SD"
+                details = (entry.path.suffix[1:], "", "")
 
             table.add_row(
-                model_file.name,
+                f"  {entry.path.name}",
                 f"{size_gb:.2f} GB",
-                model_type
+                *details,
+                entry.autov2 or "…"
             )
 
-        table.add_row("", "", "", style="dim")
+        table.add_row("", "", "", "", "", "", style="dim")
         table.add_row(
-            f"Total: {model_count} models",
+            f"Total: {len(entries)} models",
             f"{total_size:.2f} GB",
-            "",
+            "", "", "", "",
             style="bold cyan"
         )
     else:
-        table.add_row("No models found", "", "")
+        table.add_row("No models found", "", "", "", "", "")
 
     console.print(table)
+    pending = catalog.pending()
+    if pending:
+        console.print(f"[dim]Hashing {pending} model(s) in the background…[/]")
     console.print()
 
 
@@ -495,10 +1498,16 @@ def display_storage():
         (SCRIPTS_DIR, "Scripts"),
     ]
 
+    # One pass over the hub sizes every directory in it
+    hub_sizes = dir_sizer().scan(AI_HUB)
+
     total_size = 0.0
     for dir_path, description in dirs:
         if dir_path.exists():
-            size_gb = get_dir_size_gb(dir_path)
+            if dir_path in hub_sizes:
+                size_gb = hub_sizes[dir_path] / (1024**3)
+            else:
+                size_gb = get_dir_size_gb(dir_path)  # symlinked out of the hub
             total_size += size_gb
             table.add_row(
                 dir_path.name,
@@ -518,42 +1527,119 @@ def display_storage():
     console.print()
 
 
-def check_model_requirements(model_name: str) -> Tuple[bool, List[str]]:
-    """Check if system meets requirements for a model"""
-    specs = get_system_specs()
+def estimate_requirements(name: str, info: ModelInfo, resolution: Optional[Tuple[int, int]] = None,
+                          batch_size: int = 1, offload: str = "none", disk_gb: float = 0.0) -> Optional[ModelRequirements]:
+    """RAM and VRAM to generate with a checkpoint, from its header
+
+    Weights are counted at the precision UIs load them in (FP32
+    checkpoints are cast to FP16); activations are scaled from the
+    architecture's native resolution by pixel count and batch size.
+    None for architectures without a profile (LoRAs, VAEs...).
+    """
+    profile = ARCHITECTURE_PROFILES.get(info.architecture)
+    if profile is None:
+        return None
+
+    bytes_per_param = min(DTYPE_BYTES.get(info.dtype, 2), 2)
+    components = info.components or {"diffusion": info.parameters}
+    weights = {part: count * bytes_per_param / (1024**3) for part, count in components.items()}
+    diffusion_gb = weights.get("diffusion", 0.0)
+    # Text encoders and VAE that are not in the file still have to be loaded
+    others_gb = sum(weights.values()) - diffusion_gb
+    if not components.get("text_encoder"):
+        others_gb += profile["extra_gb"]
+    total_gb = diffusion_gb + others_gb
+
+    native = profile["resolution"]
+    width, height = resolution or (native, native)
+    activations_gb = profile["activation_gb"] * (width * height) / (native * native) * batch_size
+
+    if offload == "none":
+        vram_gb = total_gb + activations_gb + GPU_OVERHEAD_GB
+        ram_gb = RAM_BASE_GB
+    elif offload == "model":
+        vram_gb = max(diffusion_gb, others_gb) + activations_gb + GPU_OVERHEAD_GB
+        ram_gb = RAM_BASE_GB + total_gb
+    elif offload == "sequential":
+        vram_gb = diffusion_gb * SEQUENTIAL_RESIDENT + activations_gb + GPU_OVERHEAD_GB
+        ram_gb = RAM_BASE_GB + total_gb
+    else:
+        raise ValueError(f"unknown offload mode: {offload}")
 
-    # Model requirements database
-    requirements = {
-        "flux-dev": ModelRequirements("FLUX Dev", ram_gb=16, vram_gb=12, disk_gb=24),
-        "flux-schnell": ModelRequirements("FLUX Schnell", ram_gb=16, vram_gb=12, disk_gb=24),
-        "sdxl": ModelRequirements("SDXL", ram_gb=16, vram_gb=8, disk_gb=7),
-        "sd15": ModelRequirements("SD 1.5", ram_gb=8, vram_gb=4, disk_gb=4),
-        "sd21": ModelRequirements("SD 2.1", ram_gb=8, vram_gb=6, disk_gb=5),
-    }
+    return ModelRequirements(name, ram_gb=ram_gb, vram_gb=vram_gb, disk_gb=disk_gb)
 
-    req = requirements.get(model_name)
-    if not req:
-        return True, []
 
+def requirement_issues(req: ModelRequirements, specs: SystemSpecs) -> List[str]:
+    """Ways in which a system falls short of a model's requirements"""
     issues = []
 
     # Check RAM
     if specs.ram_available_gb < req.ram_gb:
-        issues.append(f"RAM: Need {req.ram_gb}GB, have {specs.ram_available_gb:.1f}GB available")
+        issues.append(f"RAM: Need {req.ram_gb:.1f}GB, have {specs.ram_available_gb:.1f}GB available")
 
     # Check VRAM
     if specs.vram_gb is None:
-        issues.append(f"GPU: NVIDIA GPU required with {req.vram_gb}GB VRAM")
+        issues.append(f"GPU: GPU required with {req.vram_gb:.1f}GB VRAM")
     elif specs.vram_gb < req.vram_gb:
-        issues.append(f"VRAM: Need {req.vram_gb}GB, have {specs.vram_gb:.1f}GB")
+        issues.append(f"VRAM: Need {req.vram_gb:.1f}GB, have {specs.vram_gb:.1f}GB")
 
     # Check disk space
     if specs.disk_free_gb < req.disk_gb:
-        issues.append(f"Disk: Need {req.disk_gb}GB free, have {specs.disk_free_gb:.1f}GB")
+        issues.append(f"Disk: Need {req.disk_gb:.1f}GB free, have {specs.disk_free_gb:.1f}GB")
 
+    return issues
+
+
+def check_model_requirements(model_name: str, offload: str = "none") -> Tuple[bool, List[str]]:
+    """Check if system meets requirements for a model before downloading it"""
+    if model_name not in DOWNLOADABLE_MODELS:
+        return True, []
+
+    name, architecture, parameters, dtype = DOWNLOADABLE_MODELS[model_name]
+    download_gb = parameters * DTYPE_BYTES[dtype] / (1024**3)
+    info = ModelInfo(architecture, dtype, parameters, {})
+    req = estimate_requirements(name, info, offload=offload, disk_gb=download_gb)
+
+    issues = requirement_issues(req, get_system_specs())
     return len(issues) == 0, issues
 
 
+@dataclass
+class ModelFit:
+    entry: CatalogEntry
+    offload: Optional[str]  # lightest offload mode that works, None if none does
+    requirements: Dict[str, ModelRequirements]
+    issues: List[str]  # why the lightest mode fails, if offload is None
+
+
+def check_installed_models(resolution: Optional[Tuple[int, int]] = None, batch_size: int = 1) -> List[ModelFit]:
+    """Which installed checkpoints run on this system, and with what offload
+
+    One batch against the session's cached system specs; models without
+    a requirements profile (LoRAs, VAEs...) are left out.
+    """
+    specs = get_system_specs()
+    catalog = model_catalog()
+    catalog.rescan()
+
+    fits = []
+    for entry in catalog.entries():
+        if entry.info is None or entry.info.architecture not in ARCHITECTURE_PROFILES:
+            continue
+        requirements = {
+            mode: estimate_requirements(entry.path.name, entry.info, resolution, batch_size, mode)
+            for mode in OFFLOAD_MODES
+        }
+        offload, issues = None, []
+        for mode in OFFLOAD_MODES:
+            issues = requirement_issues(requirements[mode], specs)
+            if not issues:
+                offload = mode
+                break
+        fits.append(ModelFit(entry, offload, requirements, issues))
+    return fits
+
+
 def model_management_menu():
     """Interactive model management menu"""
     console.clear()
@@ -567,6 +1653,11 @@ def model_management_menu():
     console.print("  [0] Back to main menu")
     console.print()
 
+    # Catch up on model hashes while the user browses
+    catalog = model_catalog()
+    catalog.rescan()
+    catalog.start_hashing()
+
     choice = Prompt.ask("Select option", default="0")
 
     if choice == "1":
@@ -581,31 +1672,28 @@ def model_management_menu():
 
 
 def check_requirements_menu():
-    """Check system requirements for downloading a model"""
+    """Check system requirements for installed models or before downloading one"""
     console.clear()
     console.print(Panel.fit("🔍 Check Model Requirements", style="bold cyan"))
     console.print()
 
-    console.print("Available model types:")
-    console.print("  [1] FLUX Dev")
-    console.print("  [2] FLUX Schnell")
-    console.print("  [3] SDXL")
-    console.print("  [4] SD 1.5")
-    console.print("  [5] SD 2.1")
+    console.print("  [0] All installed models")
+    console.print()
+    console.print("Before downloading:")
+    choices = list(DOWNLOADABLE_MODELS)
+    for idx, key in enumerate(choices, 1):
+        console.print(f"  [{idx}] {DOWNLOADABLE_MODELS[key][0]}")
     console.print()
 
-    choice = Prompt.ask("Select model type", default="1")
+    choice = Prompt.ask("Select model type", default="0")
 
-    model_map = {
-        "1": "flux-dev",
-        "2": "flux-schnell",
-        "3": "sdxl",
-        "4": "sd15",
-        "5": "sd21"
-    }
+    if choice == "0":
+        check_installed_models_menu()
+        return
 
-    model = model_map.get(choice)
-    if not model:
+    try:
+        model = choices[int(choice) - 1]
+    except (ValueError, IndexError):
         console.print("[red]Invalid choice![/]")
         return
 
@@ -618,39 +1706,150 @@ def check_requirements_menu():
         console.print(f"[red]✗ Your system does not meet requirements for {model.upper()}:[/]")
         for issue in issues:
             console.print(f"  [yellow]• {issue}[/]")
+        offload_ok = [mode for mode in OFFLOAD_MODES[1:] if check_model_requirements(model, mode)[0]]
+        if offload_ok:
+            console.print(f"[yellow]  It can run with {offload_ok[0]} CPU offload[/]")
+
+    console.print()
+    Prompt.ask("Press Enter to continue")
+
+
+def check_installed_models_menu():
+    """Check every installed checkpoint against this system in one batch"""
+    resolution = None
+    answer = Prompt.ask("Resolution (e.g. 1024x1024, blank for each model's native)", default="")
+    if answer:
+        try:
+            width, height = (int(part) for part in answer.lower().split("x"))
+            resolution = (width, height)
+        except ValueError:
+            console.print("[red]Invalid resolution, using native[/]")
+    try:
+        batch_size = max(1, int(Prompt.ask("Batch size", default="1")))
+    except ValueError:
+        batch_size = 1
+
+    fits = check_installed_models(resolution, batch_size)
+    specs = get_system_specs()
+    vram = f"{specs.vram_gb:.1f} GB VRAM" if specs.vram_gb else "no GPU"
+
+    table = Table(title=f"Installed Models ({vram}, {specs.ram_available_gb:.1f} GB RAM free)", box=box.ROUNDED)
+    table.add_column("Model", style="cyan")
+    table.add_column("Type", style="yellow")
+    table.add_column("VRAM", justify="right")
+    table.add_column("Min VRAM", justify="right")
+    table.add_column("RAM", justify="right")
+    table.add_column("Verdict")
+
+    verdicts = {
+        "none": "[green]✓ Fits in VRAM[/]",
+        "model": "[yellow]⚠ Model offload[/]",
+        "sequential": "[yellow]⚠ Sequential offload[/]",
+        None: "[red]✗ Cannot run[/]",
+    }
+    for fit in fits:
+        lightest = fit.requirements[fit.offload or OFFLOAD_MODES[-1]]
+        table.add_row(
+            fit.entry.path.name,
+            fit.entry.info.architecture,
+            f"{fit.requirements['none'].vram_gb:.1f} GB",
+            f"{fit.requirements['sequential'].vram_gb:.1f} GB",
+            f"{lightest.ram_gb:.1f} GB",
+            verdicts[fit.offload],
+        )
+    if not fits:
+        table.add_row("No checkpoints found", "", "", "", "", "")
 
+    console.print(table)
+    for fit in fits:
+        if fit.offload is None:
+            console.print(f"[red]{fit.entry.path.name}:[/] " + "; ".join(fit.issues))
     console.print()
     Prompt.ask("Press Enter to continue")
 
 
 def consolidate_models_menu():
     """Find and consolidate duplicate models"""
+    from rich.progress import Progress, BarColumn, TextColumn, DownloadColumn, TransferSpeedColumn
+
+    roots = model_search_dirs()
     console.print("\n[yellow]Scanning for duplicate models...[/]")
+    for root in roots:
+        console.print(f"  [dim]{root}[/]")
+
+    with Progress(
+        TextColumn("[cyan]{task.description}[/]"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task("Scanning", total=None)
+        groups = find_duplicates(
+            roots,
+            on_progress=lambda stage, done, total: progress.update(task, description=stage, completed=done, total=total),
+        )
+
+    if not groups:
+        console.print("[green]✓ No duplicate models found[/]")
+        console.print()
+        Prompt.ask("Press Enter to continue")
+        return
+
+    # Dry-run report
+    table = Table(title="Duplicate Models", box=box.ROUNDED)
+    table.add_column("Model", style="cyan")
+    table.add_column("Copies", justify="right")
+    table.add_column("Reclaimable", justify="right", style="yellow")
+    table.add_column("Locations", style="dim")
+    for group in groups:
+        table.add_row(
+            group.files[0].name,
+            str(len(group.files)),
+            f"{group.reclaimable / (1024**3):.2f} GB",
+            "\n".join(str(path.parent) for path in group.files)
+        )
+    console.print(table)
+
+    total = sum(group.reclaimable for group in groups)
+    console.print(f"\n[bold]Reclaimable: {total / (1024**3):.2f} GB[/] in {len(groups)} duplicate group(s)")
+    console.print("[dim]Duplicates are replaced by links to one copy in MODELS_DIR; reflinks keep copies independent[/]")
+    console.print()
+
+    if Confirm.ask("Replace duplicates with links?", default=False):
+        mode = Prompt.ask("Link type", choices=list(LINK_MODES), default="auto")
+        reclaimed, errors = consolidate_duplicates(groups, mode)
+        dir_sizer().scan(AI_HUB)  # refresh cached sizes for the storage screens
+        console.print(f"[green]✓ Reclaimed {reclaimed / (1024**3):.2f} GB[/]")
+        for error in errors:
+            console.print(f"[red]  ✗ {error}[/]")
+    else:
+        console.print("[yellow]Dry run only, nothing changed[/]")
 
-    # This would scan ComfyUI and SD-WebUI for duplicates
-    console.print("[green]✓ All models already consolidated in ~/Projects/ai/models/checkpoints/[/]")
     console.print()
     Prompt.ask("Press Enter to continue")
 
 
 def cleanup_models_menu():
     """Interactive model cleanup"""
-    models_path = MODELS_DIR / "checkpoints"
-
-    if not models_path.exists():
+    if not MODELS_DIR.exists():
         console.print("[yellow]No models directory found[/]")
         return
 
-    models = list(models_path.glob("*.safetensors"))
+    catalog = model_catalog()
+    catalog.rescan()
+    entries = catalog.entries()
 
-    if not models:
+    if not entries:
         console.print("[yellow]No models to clean up[/]")
         return
 
+    models = [entry.path for entry in entries]
     console.print("\n[bold]Current models:[/]")
-    for idx, model in enumerate(models, 1):
-        size_gb = model.stat().st_size / (1024**3)
-        console.print(f"  [{idx}] {model.name} ({size_gb:.2f} GB)")
+    for idx, entry in enumerate(entries, 1):
+        size_gb = entry.size / (1024**3)
+        console.print(f"  [{idx}] {entry.folder}/{entry.path.name} ({size_gb:.2f} GB)")
 
     console.print()
     if Confirm.ask("Would you like to remove any models?"):
@@ -661,6 +1860,7 @@ def cleanup_models_menu():
                 model_to_remove = models[idx - 1]
                 if Confirm.ask(f"Really delete {model_to_remove.name}?"):
                     model_to_remove.unlink()
+                    catalog.rescan()
                     console.print(f"[green]✓ Removed {model_to_remove.name}[/]")
         except ValueError:
             console.print("[red]Invalid choice![/]")
@@ -676,7 +1876,9 @@ def storage_and_system_menu():
     console.print()
 
     specs = get_system_specs()
-    hub_size = get_dir_size_gb(AI_HUB)
+    # Subtotals come from the same pass as the hub total
+    hub_sizes = dir_sizer().scan(AI_HUB)
+    hub_size = hub_sizes.get(AI_HUB, 0) / (1024**3)
 
     # Left column: System specs
     sys_table = Table.grid(padding=(0, 1))
@@ -699,9 +1901,9 @@ def storage_and_system_menu():
     storage_table.add_row(f"[{THEME['accent']}]Hub Total:[/]", f"{hub_size:.1f} GB")
 
     # Calculate major directories
-    models_size = get_dir_size_gb(MODELS_DIR) if MODELS_DIR.exists() else 0
-    workspaces_size = get_dir_size_gb(WORKSPACES_DIR) if WORKSPACES_DIR.exists() else 0
-    configs_size = get_dir_size_gb(CONFIGS_DIR) if CONFIGS_DIR.exists() else 0
+    models_size = hub_sizes.get(MODELS_DIR, 0) / (1024**3)
+    workspaces_size = hub_sizes.get(WORKSPACES_DIR, 0) / (1024**3)
+    configs_size = hub_sizes.get(CONFIGS_DIR, 0) / (1024**3)
 
     storage_table.add_row(f"[{THEME['muted']}]Models:[/]", f"{models_size:.1f} GB")
     storage_table.add_row(f"[{THEME['muted']}]Workspaces:[/]", f"{workspaces_size:.1f} GB")
@@ -716,8 +1918,9 @@ def storage_and_system_menu():
     tool_table.add_row(f"[{THEME['accent']}]Tools:[/]", str(len(launchers)))
 
     # Count models
-    models_path = MODELS_DIR / "checkpoints"
-    model_count = len(list(models_path.glob("*.safetensors"))) if models_path.exists() else 0
+    catalog = model_catalog()
+    catalog.rescan()
+    model_count = len(catalog.entries())
     tool_table.add_row(f"[{THEME['accent']}]Models:[/]", str(model_count))
 
     # Display in columns
@@ -731,9 +1934,263 @@ def storage_and_system_menu():
     Prompt.ask(f"\n[{THEME['muted']}]Press Enter to continue[/]")
 
 
+@dataclass
+class GpuSample:
+    util_percent: float
+    vram_used_gb: float
+    vram_total_gb: float
+
+
+class GpuMonitor:
+    """Latest utilization and VRAM use of the first GPU
+
+    Reads from one long-lived source: an NVML handle when pynvml is
+    installed, else a single `nvidia-smi --loop-ms` process whose output a
+    reader thread keeps up with, else amdgpu sysfs files. read() never
+    blocks on the GPU; it returns the last value seen, or None.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._nvml = None
+        self._handle = None
+        self._process = None
+        self._amd = None
+        self._latest = None
+
+    def start(self):
+        try:
+            import pynvml
+
+            pynvml.nvmlInit()
+            self._handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+            self._nvml = pynvml
+            return
+        except Exception:
+            pass  # no pynvml, no driver or no NVIDIA GPU
+
+        if shutil.which("nvidia-smi"):
+            try:
+                self._process = subprocess.Popen(
+                    ["nvidia-smi", "--id=0", "--query-gpu=utilization.gpu,memory.used,memory.total",
+                     "--format=csv,noheader,nounits", f"--loop-ms={max(100, int(self.interval * 1000))}"],
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+                )
+            except OSError:
+                self._process = None
+            else:
+                threading.Thread(target=self._follow, name="nvidia-smi", daemon=True).start()
+                return
+
+        for device in sorted(Path("/sys/class/drm").glob("card[0-9]*/device")):
+            if (device / "gpu_busy_percent").exists() and (device / "mem_info_vram_used").exists():
+                self._amd = device
+                return
+
+    def _follow(self):
+        for line in self._process.stdout:
+            try:
+                util, used, total = (float(field) for field in line.split(","))
+            except ValueError:
+                continue
+            self._latest = GpuSample(util, used / 1024, total / 1024)
+
+    def read(self) -> Optional[GpuSample]:
+        if self._nvml:
+            try:
+                util = self._nvml.nvmlDeviceGetUtilizationRates(self._handle)
+                memory = self._nvml.nvmlDeviceGetMemoryInfo(self._handle)
+                return GpuSample(util.gpu, memory.used / (1024**3), memory.total / (1024**3))
+            except Exception:
+                return None
+        if self._amd:
+            try:
+                return GpuSample(
+                    float((self._amd / "gpu_busy_percent").read_text()),
+                    int((self._amd / "mem_info_vram_used").read_text()) / (1024**3),
+                    int((self._amd / "mem_info_vram_total").read_text()) / (1024**3),
+                )
+            except (OSError, ValueError):
+                return None
+        return self._latest
+
+    def stop(self):
+        if self._nvml:
+            try:
+                self._nvml.nvmlShutdown()
+            except Exception:
+                pass
+        if self._process:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=PROBE_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+
+
+@dataclass
+class LiveSample:
+    cpu_percent: Optional[float]
+    load_avg: Tuple[float, float, float]
+    ram_available_gb: float
+    ram_total_gb: float
+    gpu: Optional[GpuSample]
+    disk_free_gb: float
+
+
+def _cpu_times() -> Tuple[int, int]:
+    """(idle, total) jiffies across all CPUs from /proc/stat"""
+    fields = [int(field) for field in (_read_text(Path("/proc/stat")) or "cpu 0").splitlines()[0].split()[1:]]
+    idle = sum(fields[3:5])  # idle + iowait
+    return idle, sum(fields)
+
+
+class LiveSampler:
+    """Background threads feeding the live dashboard
+
+    One thread samples CPU, RAM, GPU and free disk every interval seconds
+    from /proc and the GpuMonitor; another fills in the static hardware
+    facts and rescans hub sizes now and then. The render side only reads
+    the latest values, so drawing never waits on a probe.
+    """
+
+    def __init__(self, interval: float = DASHBOARD_INTERVAL):
+        self.interval = interval
+        self.sample: Optional[LiveSample] = None
+        self.static: Optional[Dict] = None
+        self.hub_sizes: Dict[Path, Optional[int]] = {}
+        self._gpu = GpuMonitor(interval)
+        self._stop = threading.Event()
+
+    def start(self):
+        sizer = dir_sizer()
+        self.hub_sizes = {path: sizer.cached_size(path) for path in (AI_HUB, MODELS_DIR, WORKSPACES_DIR, CONFIGS_DIR)}
+        self._gpu.start()
+        threading.Thread(target=self._sample_loop, name="dashboard-sampler", daemon=True).start()
+        threading.Thread(target=self._slow_loop, name="dashboard-sizes", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        self._gpu.stop()
+
+    def _sample_loop(self):
+        previous = _cpu_times()
+        cpu_percent = None
+        while True:
+            memory = _meminfo_gb()
+            try:
+                disk_free_gb = shutil.disk_usage(AI_HUB).free / (1024**3)
+            except OSError:
+                disk_free_gb = 0.0
+            try:
+                load_avg = os.getloadavg()
+            except OSError:
+                load_avg = (0.0, 0.0, 0.0)
+            self.sample = LiveSample(
+                cpu_percent=cpu_percent,
+                load_avg=load_avg,
+                ram_available_gb=memory.get("MemAvailable", 0.0),
+                ram_total_gb=memory.get("MemTotal", 0.0),
+                gpu=self._gpu.read(),
+                disk_free_gb=disk_free_gb,
+            )
+            if self._stop.wait(self.interval):
+                return
+            current = _cpu_times()
+            idle, total = current[0] - previous[0], current[1] - previous[1]
+            cpu_percent = 100.0 * (1 - idle / total) if total > 0 else 0.0
+            previous = current
+
+    def _slow_loop(self):
+        self.static = hardware_probe().static()
+        while not self._stop.is_set():
+            sizes = dir_sizer().scan(AI_HUB)
+            self.hub_sizes = {path: sizes.get(path, 0) for path in self.hub_sizes}
+            self._stop.wait(DASHBOARD_SIZE_REFRESH)
+
+
+def _usage_bar(fraction: float, width: int = 20) -> str:
+    fraction = min(max(fraction, 0.0), 1.0)
+    color = THEME['success'] if fraction < 0.7 else THEME['warning'] if fraction < 0.9 else THEME['error']
+    filled = round(fraction * width)
+    return f"[{color}]{'█' * filled}[/][{THEME['muted']}]{'░' * (width - filled)}[/]"
+
+
+def render_dashboard(sampler: LiveSampler):
+    """Dashboard frame from the sampler's latest values"""
+    from rich.columns import Columns
+    from rich.console import Group
+
+    pending = f"[{THEME['muted']}]…[/]"
+    sample = sampler.sample
+    static = sampler.static
+
+    sys_table = Table.grid(padding=(0, 1))
+    sys_table.add_column(style=THEME['accent'])
+    sys_table.add_column(style="white")
+
+    sys_table.add_row("CPU:", static["cpu"] if static else pending)
+    if sample and sample.cpu_percent is not None:
+        sys_table.add_row("Load:", f"{_usage_bar(sample.cpu_percent / 100)} {sample.cpu_percent:5.1f}%")
+    else:
+        sys_table.add_row("Load:", pending)
+    if sample:
+        sys_table.add_row("", f"[{THEME['muted']}]loadavg {sample.load_avg[0]:.2f} {sample.load_avg[1]:.2f} {sample.load_avg[2]:.2f}[/]")
+        if sample.ram_total_gb:
+            used = sample.ram_total_gb - sample.ram_available_gb
+            sys_table.add_row("RAM:", f"{_usage_bar(used / sample.ram_total_gb)} {used:.1f}/{sample.ram_total_gb:.1f} GB")
+        if sample.gpu:
+            gpu = sample.gpu
+            sys_table.add_row("GPU:", f"{_usage_bar(gpu.util_percent / 100)} {gpu.util_percent:5.1f}%")
+            if gpu.vram_total_gb:
+                sys_table.add_row("VRAM:", f"{_usage_bar(gpu.vram_used_gb / gpu.vram_total_gb)} {gpu.vram_used_gb:.1f}/{gpu.vram_total_gb:.1f} GB")
+        elif static and not static["gpu"]:
+            sys_table.add_row("GPU:", f"[{THEME['muted']}]not detected[/]")
+        sys_table.add_row("Disk:", f"{sample.disk_free_gb:.1f} GB free")
+
+    storage_table = Table.grid(padding=(0, 1))
+    storage_table.add_column(style=THEME['accent'])
+    storage_table.add_column(style="white", justify="right")
+    for label, path in (("Hub Total:", AI_HUB), ("Models:", MODELS_DIR), ("Workspaces:", WORKSPACES_DIR), ("Configs:", CONFIGS_DIR)):
+        size = sampler.hub_sizes.get(path)
+        storage_table.add_row(label, f"{size / (1024**3):.1f} GB" if size is not None else pending)
+
+    return Group(
+        Columns([
+            Panel(sys_table, title="Hardware (live)", border_style=THEME['border']),
+            Panel(storage_table, title="Storage", border_style=THEME['border']),
+        ], expand=True),
+        f"[{THEME['muted']}]Sampling every {sampler.interval:g}s • press any key to return[/]",
+    )
+
+
+def dashboard_interval() -> float:
+    """Sampling interval from $AI_HUB_DASHBOARD_INTERVAL, else the default"""
+    try:
+        return max(0.1, float(os.environ["AI_HUB_DASHBOARD_INTERVAL"]))
+    except (KeyError, ValueError):
+        return DASHBOARD_INTERVAL
+
+
+def live_dashboard_menu(interval: Optional[float] = None):
+    """Live-updating system and storage dashboard"""
+    import readchar
+    from rich.live import Live
+
+    sampler = LiveSampler(interval or dashboard_interval())
+    sampler.start()
+    try:
+        with Live(console=console, screen=True, refresh_per_second=4,
+                  get_renderable=lambda: render_dashboard(sampler)):
+            readchar.readkey()
+    finally:
+        sampler.stop()
+
+
 def theme_selector_menu():
     """Interactive theme selector"""
     global THEME
+    import readchar
 
     current_theme_name = load_theme_config() or detect_vim_theme()
 
@@ -790,6 +2247,34 @@ def theme_selector_menu():
                 pass
 
 
+# prompt-library.py loaded as a module plus one PromptLibrary for the whole
+# session; False once loading failed and the menu uses subprocesses instead
+_prompt_library = None
+
+
+def get_prompt_library():
+    """(module, library) for in-process use, or None to fall back to subprocesses"""
+    global _prompt_library
+    if _prompt_library is None:
+        try:
+            spec = importlib.util.spec_from_file_location("prompt_library", PROMPT_LIBRARY_SCRIPT)
+            module = importlib.util.module_from_spec(spec)
+            # Registered so worker processes can unpickle its functions
+            sys.modules["prompt_library"] = module
+            spec.loader.exec_module(module)
+            _prompt_library = (module, module.PromptLibrary())
+        except Exception as e:
+            sys.modules.pop("prompt_library", None)
+            console.print(f"[{THEME['warning']}]Prompt library not loaded in-process ({e}), using subprocesses[/]")
+            _prompt_library = False
+    return _prompt_library or None
+
+
+def run_prompt_library(*args: str):
+    """Run a prompt-library.py command in a child process (fallback path)"""
+    subprocess.run([sys.executable, str(PROMPT_LIBRARY_SCRIPT), *args])
+
+
 def prompt_library_menu():
     """Prompt Library menu - Browse and manage ComfyUI prompts"""
     console.clear()
@@ -805,24 +2290,56 @@ def prompt_library_menu():
     console.print()
 
     choice = Prompt.ask("Select option", default="0")
+    if choice not in ("1", "2", "3", "4", "5"):
+        return
+
+    loaded = get_prompt_library()
+    if loaded:
+        module, library = loaded
+        # Pick up edits made outside the hub since the last action
+        library.refresh()
 
     if choice == "1":
         # Launch the prompt library TUI
-        subprocess.run([sys.executable, str(SCRIPTS_DIR / "prompt-library.py"), "browse"])
+        if loaded:
+            module.browse_prompts_tui(library)
+        else:
+            run_prompt_library("browse")
     elif choice == "2":
-        subprocess.run([sys.executable, str(SCRIPTS_DIR / "prompt-library.py"), "add"])
+        if loaded:
+            module.create_prompt_interactive(library)
+        else:
+            run_prompt_library("add")
     elif choice == "3":
         query = Prompt.ask("Search query")
-        subprocess.run([sys.executable, str(SCRIPTS_DIR / "prompt-library.py"), "list", "--search", query])
+        if loaded:
+            results = library.search_prompts(query)
+            console.print(f"[{THEME['primary']}]Search results for '{query}':[/]")
+            for name in results:
+                console.print(f"  • {name}")
+            if not results:
+                console.print(f"[{THEME['warning']}]No prompts found[/]")
+        else:
+            run_prompt_library("list", "--search", query)
         Prompt.ask("\nPress Enter to continue")
     elif choice == "4":
         name = Prompt.ask("Prompt name")
-        subprocess.run([sys.executable, str(SCRIPTS_DIR / "prompt-library.py"), "view", name])
+        if loaded:
+            prompt = library.load_prompt(name)
+            if prompt:
+                module.display_prompt(prompt)
+            else:
+                console.print(f"[{THEME['error']}]Prompt '{name}' not found![/]")
+        else:
+            run_prompt_library("view", name)
         Prompt.ask("\nPress Enter to continue")
     elif choice == "5":
         name = Prompt.ask("Prompt name")
         output = Prompt.ask("Output file path", default=f"{Path.home()}/{name}.txt")
-        subprocess.run([sys.executable, str(SCRIPTS_DIR / "prompt-library.py"), "export", name, output])
+        if loaded:
+            library.export_txt(name, Path(output).expanduser())
+        else:
+            run_prompt_library("export", name, output)
         Prompt.ask("\nPress Enter to continue")
 
 
@@ -830,6 +2347,9 @@ def main_menu():
     """Main TUI menu - Interactive tool launcher with keyboard navigation"""
     selected = 0
 
+    # nvidia-smi and friends run while the user is still in the menu
+    hardware_probe().start()
+
     while True:
         # Get available launchers
         launchers = sorted(SCRIPTS_DIR.glob("launch-*.sh"))
@@ -847,6 +2367,7 @@ def main_menu():
             console.print()
             console.print("Press 'q' to exit...")
 
+            import readchar
             key = readchar.readkey()
             if key.lower() == 'q':
                 break
@@ -864,9 +2385,6 @@ def main_menu():
         ))
         console.print()
 
-        # Display tool list with ASCII art overlay and info panel on right
-        from rich.columns import Columns
-
         # Get selected tool info
         selected_launcher = launchers[selected]
         selected_tool_name = selected_launcher.stem.replace("launch-", "").replace("-", " ").title()
@@ -898,9 +2416,10 @@ def main_menu():
         console.print(info_line)
 
         console.print()
-        console.print(f"[{THEME['muted']}]Navigation: [{THEME['primary']}]↑/k[/] up • [{THEME['primary']}]↓/j[/] down • [{THEME['primary']}]Enter[/] launch • [{THEME['warning']}]s[/]=System • [{THEME['warning']}]m[/]=Models • [{THEME['warning']}]p[/]=Prompts • [{THEME['warning']}]t[/]=Theme • [{THEME['error']}]q[/]=Quit[/]")
+        console.print(f"[{THEME['muted']}]Navigation: [{THEME['primary']}]↑/k[/] up • [{THEME['primary']}]↓/j[/] down • [{THEME['primary']}]Enter[/] launch • [{THEME['warning']}]s[/]=System • [{THEME['warning']}]d[/]=Dashboard • [{THEME['warning']}]m[/]=Models • [{THEME['warning']}]p[/]=Prompts • [{THEME['warning']}]t[/]=Theme • [{THEME['error']}]q[/]=Quit[/]")
 
         # Handle keyboard input
+        import readchar
         key = readchar.readkey()
 
         # Navigation
@@ -935,6 +2454,8 @@ def main_menu():
 
         elif key.lower() == 's':
             storage_and_system_menu()
+        elif key.lower() == 'd':
+            live_dashboard_menu()
         elif key.lower() == 'm':
             model_management_menu()
         elif key.lower() == 'p':
@@ -947,7 +2468,8 @@ def main_menu():
             break
 
 
-if __name__ == "__main__":
+def cli():
+    """Run the hub with its interrupt and error handling"""
     try:
         main_menu()
     except KeyboardInterrupt:
@@ -956,3 +2478,7 @@ if __name__ == "__main__":
     except Exception as e:
         console.print(f"\n[red]Error: {e}[/]")
         sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
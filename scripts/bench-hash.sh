@@ -0,0 +1,88 @@
+#!/bin/bash
+# Hashing throughput benchmark for the hub's model hasher
+#
+# Usage: scripts/bench-hash.sh [model files...]
+#
+# Without arguments, writes $BENCH_FILES test files of $BENCH_SIZE_MB MB
+# each under $BENCH_DIR (default /var/tmp, which unlike a tmpfs /tmp is
+# backed by disk) and removes them afterwards. Every run starts cold:
+# the files are evicted from the page cache with posix_fadvise first.
+#
+# Plain reads give the disk's bandwidth; the hub's hasher should get
+# close to it, one file at a time and with all files hashed at once.
+
+SCRIPTS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+BENCH_FILES="${BENCH_FILES:-4}"
+BENCH_SIZE_MB="${BENCH_SIZE_MB:-512}"
+BENCH_DIR="${BENCH_DIR:-/var/tmp}"
+
+FILES=("$@")
+if [ ${#FILES[@]} -eq 0 ]; then
+    WORK_DIR="$(mktemp -d "$BENCH_DIR/ai-hub-bench-hash.XXXXXX")"
+    trap 'rm -r "$WORK_DIR"' EXIT
+    echo "Writing $BENCH_FILES x $BENCH_SIZE_MB MB test files to $WORK_DIR..."
+    for i in $(seq 1 "$BENCH_FILES"); do
+        head -c "${BENCH_SIZE_MB}M" /dev/urandom > "$WORK_DIR/model-$i.safetensors"
+        FILES+=("$WORK_DIR/model-$i.safetensors")
+    done
+    sync
+    echo ""
+fi
+
+python3 - "$SCRIPTS_DIR/ai-hub-tui.py" "${FILES[@]}" <<'EOF'
+import importlib.util, os, shutil, subprocess, sys, time
+
+spec = importlib.util.spec_from_file_location("ai_hub_tui", sys.argv[1])
+hub = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(hub)
+
+paths = [hub.Path(p) for p in sys.argv[2:]]
+total = sum(p.stat().st_size for p in paths)
+
+
+def evict():
+    for path in paths:
+        with open(path, "rb") as f:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def plain_read():
+    buffer = bytearray(hub.HASH_CHUNK_SIZE)
+    for path in paths:
+        with open(path, "rb", buffering=0) as f:
+            while f.readinto(buffer):
+                pass
+
+
+def sequential():
+    for path in paths:
+        hub.full_hash(path)
+
+
+def concurrent():
+    for _ in hub.hash_files(paths):
+        pass
+
+
+def sha256sum():
+    subprocess.run(["sha256sum", *map(str, paths)], stdout=subprocess.DEVNULL, check=True)
+
+
+runs = [
+    ("read only (disk)", plain_read),
+    ("full_hash, 1 file at a time", sequential),
+    (f"hash_files, {hub.HASH_WORKERS} workers", concurrent),
+]
+if shutil.which("sha256sum"):
+    runs.append(("sha256sum (reference)", sha256sum))
+
+print("═══════════════════════════════════════════════════════")
+print(f"   HASH BENCHMARK ({len(paths)} files, {total / 1024**2:.0f} MB, cold cache)")
+print("═══════════════════════════════════════════════════════")
+for label, run in runs:
+    evict()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:32} {total / 1024**2 / elapsed:8.0f} MB/s")
+EOF
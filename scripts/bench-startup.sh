@@ -0,0 +1,75 @@
+#!/bin/bash
+# Startup benchmark for the prompt-lib and ai-hub entry points
+#
+# Usage: scripts/bench-startup.sh [runs]
+#
+# Prints the best-of-N wall time of common non-interactive commands, then
+# the slowest top-level imports of each as reported by Python's -X
+# importtime (via PYTHONPROFILEIMPORTTIME, so it also works through the
+# bash wrappers), to spot a heavy module creeping back into startup.
+
+SCRIPTS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+RUNS="${1:-10}"
+
+# First prompt in the library, for `view`
+PROMPT_NAME="$("$SCRIPTS_DIR/prompt-lib" list 2>/dev/null | sed -n 's/^  • //p' | head -n 1)"
+
+# label|command (the hub is imported without starting its menu)
+COMMANDS=(
+    "python3 (baseline)|python3 -c pass"
+    "prompt-lib list|$SCRIPTS_DIR/prompt-lib list"
+    "prompt-lib view|$SCRIPTS_DIR/prompt-lib view $PROMPT_NAME"
+    "prompt-lib search|$SCRIPTS_DIR/prompt-lib search portrait"
+    "ai-hub import|python3 -c import runpy; runpy.run_path('$SCRIPTS_DIR/ai-hub-tui.py')"
+)
+
+# Split "label|command" into an argv array, keeping `-c` code in one piece
+command_args() {
+    local spec="${1#*|}"
+    if [[ "$spec" == *" -c "* ]]; then
+        args=("${spec%% -c *}" "-c" "${spec#* -c }")
+    else
+        read -ra args <<< "$spec"
+    fi
+}
+
+best_ms() {
+    python3 - "$RUNS" "$@" <<'EOF'
+import subprocess, sys, time
+
+runs, argv = int(sys.argv[1]), sys.argv[2:]
+best = float("inf")
+for _ in range(runs):
+    start = time.perf_counter()
+    subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    best = min(best, time.perf_counter() - start)
+print(f"{best * 1000:7.1f} ms")
+EOF
+}
+
+if [ -n "$PYTHONDONTWRITEBYTECODE" ]; then
+    echo "Note: PYTHONDONTWRITEBYTECODE is set, so scripts are recompiled on every run"
+    echo ""
+fi
+
+echo "═══════════════════════════════════════════════════════"
+echo "           STARTUP BENCHMARK (best of $RUNS)"
+echo "═══════════════════════════════════════════════════════"
+for entry in "${COMMANDS[@]}"; do
+    command_args "$entry"
+    printf '%-20s %s\n' "${entry%%|*}" "$(best_ms "${args[@]}")"
+done
+
+echo ""
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "SLOWEST IMPORTS (cumulative µs)"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+for entry in "${COMMANDS[@]:1}"; do
+    command_args "$entry"
+    echo "[${entry%%|*}]"
+    PYTHONPROFILEIMPORTTIME=1 "${args[@]}" 2>&1 >/dev/null \
+        | awk -F'|' '/^import time:/ && $3 ~ /^ [^ ]/' \
+        | sort -t'|' -k2 -n \
+        | tail -n 5 \
+        | awk -F'|' '{ printf "  %10s  %s\n", $2, $3 }'
+done
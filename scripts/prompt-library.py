@@ -6,31 +6,58 @@ Portable prompt storage with CLI and TUI interfaces
 
 import os
 import sys
+import io
+import re
+import csv
+import gzip
 import json
+import queue
+import base64
+import hashlib
+import shutil
+import signal
+import socket
+import selectors
+import threading
+import mmap
+import time
+import fcntl
+import struct
+import array
+import sqlite3
 import subprocess
+import importlib.util
+from collections import deque, OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple, Iterator
 from datetime import datetime
 
+# Only what every command needs is imported here; tables, syntax
+# highlighting, progress bars, Live and readchar are imported where used
+# so that list/view/search start quickly (see scripts/bench-startup.sh)
 try:
     from rich.console import Console
-    from rich.table import Table
     from rich.panel import Panel
     from rich.prompt import Prompt, Confirm
-    from rich.syntax import Syntax
-    from rich import box
-    import readchar
+    from rich.text import Text
+    from rich.markup import escape
+    if importlib.util.find_spec("readchar") is None:
+        raise ImportError("readchar")
 except ImportError:
     print("Installing dependencies...")
     subprocess.run([sys.executable, "-m", "pip", "install", "--break-system-packages", "rich", "readchar"], check=True)
     from rich.console import Console
-    from rich.table import Table
     from rich.panel import Panel
     from rich.prompt import Prompt, Confirm
-    from rich.syntax import Syntax
-    from rich import box
-    import readchar
+    from rich.text import Text
+    from rich.markup import escape
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 console = Console()
 
@@ -40,11 +67,74 @@ PROMPTS_DIR = AI_HUB / "prompts"
 COMFYUI_DIR = PROMPTS_DIR / "comfyui"
 GENERAL_DIR = PROMPTS_DIR / "general"
 TEMPLATES_DIR = PROMPTS_DIR / "templates"
-
-
-@dataclass
+INDEX_FILE = ".index.db"
+PACK_FILE = "library.pack"
+PACK_INDEX_FILE = "library.pack.idx"
+LOCK_FILE = ".lock"
+SERIALIZER_FILE = ".serializer.json"
+DEFAULT_CACHE_SIZE = 512
+
+# Prompt encoding (see PromptSerializer); decoding detects the format
+SERIALIZER_BACKENDS = ("auto", "json", "orjson")
+COMPRESSIONS = ("none", "gzip", "zstd")
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 9
+
+# Library daemon (serve)
+DAEMON_COMMANDS = ("list", "search", "view")
+DAEMON_CACHE_SIZE = 100_000
+DAEMON_POLL_INTERVAL = 2.0
+DAEMON_TIMEOUT = 5.0
+
+# Bulk import
+IMPORT_BATCH_SIZE = 500
+# No prompt comes near this; a record that does not decode within it is malformed
+IMPORT_MAX_RECORD_SIZE = 16 * 1024 * 1024
+CONFLICT_POLICIES = ("skip", "overwrite", "rename")
+
+# Batch export
+EXPORT_FORMATS = ("txt", "jsonl", "csv", "workflow")
+CSV_COLUMNS = ("name", "category", "tags", "positive", "negative", "settings", "notes", "created", "modified")
+DEFAULT_CHECKPOINT = "v1-5-pruned-emaonly.safetensors"
+
+# Near-duplicate detection: 128 MinHash slots split into 16 LSH bands of 8 rows,
+# which makes pairs above ~0.7 Jaccard similarity very likely to share a band
+SHINGLE_SIZE = 2
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+DENSIFY_OFFSET = 1 << 57
+DEDUPE_THRESHOLD = 0.8
+# Bands shared by more distinct signatures than this (a common negative
+# prompt, or a large family of variants) are not compared pairwise; each
+# member is compared with at most LSH_BUCKET_LEADERS leaders instead
+LSH_MAX_BUCKET = 64
+LSH_BUCKET_LEADERS = 8
+
+# A1111-style sampler names -> ComfyUI (sampler_name, scheduler)
+COMFY_SAMPLERS = {
+    "euler": ("euler", "normal"),
+    "euler a": ("euler_ancestral", "normal"),
+    "heun": ("heun", "normal"),
+    "lms": ("lms", "normal"),
+    "ddim": ("ddim", "ddim_uniform"),
+    "unipc": ("uni_pc", "normal"),
+    "dpm++ 2m": ("dpmpp_2m", "normal"),
+    "dpm++ 2s a": ("dpmpp_2s_ancestral", "normal"),
+    "dpm++ sde": ("dpmpp_sde", "normal"),
+    "dpm++ 2m sde": ("dpmpp_2m_sde", "normal"),
+}
+
+
+@dataclass(slots=True)
 class ComfyPrompt:
-    """Represents a ComfyUI generation prompt"""
+    """Represents a ComfyUI generation prompt
+
+    Slotted (no per-instance __dict__) with interned tags and category, so
+    large libraries can be held in memory for search and dedup.
+    """
     name: str
     positive: str
     negative: str
@@ -55,71 +145,1278 @@ class ComfyPrompt:
     created: Optional[str] = None
     modified: Optional[str] = None
 
+    def __post_init__(self):
+        # Tags and categories repeat across thousands of prompts - share one string each
+        if isinstance(self.category, str):
+            self.category = sys.intern(self.category)
+        if isinstance(self.tags, list):
+            try:
+                self.tags = list(map(sys.intern, self.tags))
+            except TypeError:
+                pass  # Non-string tags are left as-is
+
     def to_dict(self):
-        return asdict(self)
+        # Shallow on purpose: asdict() deep-copies tags and settings on every call
+        return {
+            "name": self.name,
+            "positive": self.positive,
+            "negative": self.negative,
+            "tags": self.tags,
+            "category": self.category,
+            "settings": self.settings,
+            "notes": self.notes,
+            "created": self.created,
+            "modified": self.modified,
+        }
 
     @classmethod
     def from_dict(cls, data: dict):
         return cls(**data)
 
 
+class PromptCache:
+    """Bounded LRU cache of parsed prompts shared by one PromptLibrary
+
+    Entries are keyed by name and validated against the store signature
+    (mtime_ns, size), so an edited prompt is never served stale. Cached
+    prompts are shared instances - treat them as read-only.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[tuple, ComfyPrompt]]" = OrderedDict()
+
+    def get(self, name: str, signature: tuple) -> Optional[ComfyPrompt]:
+        entry = self._entries.get(name)
+        if entry is None or entry[0] != signature:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(name)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, name: str, signature: tuple, prompt: ComfyPrompt):
+        if self.maxsize <= 0:
+            return
+        self._entries[name] = (signature, prompt)
+        self._entries.move_to_end(name)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, name: str):
+        self._entries.pop(name, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+def _zstd():
+    """zstd codec module (stdlib on 3.14+, else the zstandard package) or None"""
+    try:
+        from compression import zstd
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+def _decompress(data: bytes) -> bytes:
+    """Undo gzip/zstd compression, recognised by magic bytes"""
+    if data[:2] == GZIP_MAGIC:
+        return gzip.decompress(data)
+    if data[:4] == ZSTD_MAGIC:
+        zstd = _zstd()
+        if zstd is None:
+            raise ValueError("prompt is zstd-compressed; install zstandard to read it")
+        return zstd.decompress(data)
+    return data
+
+
+def decode_prompt(data: bytes) -> dict:
+    """Parse a stored prompt in any supported encoding
+
+    The format is detected from the payload itself, so a library can mix
+    files written with different serializer settings.
+    """
+    data = _decompress(data)
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # stdlib json is more lenient (NaN, Infinity)
+    return json.loads(data)
+
+
+@dataclass(frozen=True)
+class PromptSerializer:
+    """How prompts are encoded when written
+
+    backend: json, orjson, or auto (orjson when installed)
+    compact: no indentation or spaces instead of indent=2
+    compression: none, gzip or zstd - for archive libraries
+    """
+    backend: str = "auto"
+    compact: bool = False
+    compression: str = "none"
+
+    def __post_init__(self):
+        if self.backend not in SERIALIZER_BACKENDS:
+            raise ValueError(f"backend must be one of {', '.join(SERIALIZER_BACKENDS)}")
+        if self.compression not in COMPRESSIONS:
+            raise ValueError(f"compression must be one of {', '.join(COMPRESSIONS)}")
+        if self.backend == "orjson" and orjson is None:
+            raise ValueError("orjson is not installed (pip install orjson)")
+        if self.compression == "zstd" and _zstd() is None:
+            raise ValueError("zstd needs Python 3.14+ or the zstandard package (pip install zstandard)")
+
+    @property
+    def uses_orjson(self) -> bool:
+        return self.backend == "orjson" or (self.backend == "auto" and orjson is not None)
+
+    def encode(self, data: dict) -> bytes:
+        if self.uses_orjson:
+            raw = orjson.dumps(data, option=0 if self.compact else orjson.OPT_INDENT_2)
+        elif self.compact:
+            raw = json.dumps(data, separators=(",", ":")).encode()
+        else:
+            raw = json.dumps(data, indent=2).encode()
+
+        if self.compression == "gzip":
+            return gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+        if self.compression == "zstd":
+            return _zstd().compress(raw, ZSTD_LEVEL)
+        return raw
+
+    def describe(self) -> str:
+        backend = "orjson" if self.uses_orjson else "json"
+        style = "compact" if self.compact else "pretty"
+        return f"{backend}, {style}" + (f", {self.compression}" if self.compression != "none" else "")
+
+    @classmethod
+    def load(cls, library_dir: Path) -> "PromptSerializer":
+        """Settings saved by `reformat`, or the pretty-printed default"""
+        try:
+            settings = json.loads((library_dir / SERIALIZER_FILE).read_text())
+            return cls(**settings)
+        except FileNotFoundError:
+            return cls()
+        except (TypeError, ValueError) as e:
+            console.print(f"[yellow]Ignoring {SERIALIZER_FILE}: {e}[/]")
+            return cls()
+
+    def save(self, library_dir: Path):
+        atomic_write(library_dir / SERIALIZER_FILE, json.dumps(asdict(self), indent=2).encode())
+
+
+class LibraryLock:
+    """Advisory flock on a library's lock file, shared by every writer
+
+    Reentrant, and also serializes threads of this process, so a save that
+    runs inside a bulk operation does not deadlock on itself. Use
+    library_lock() to get the one instance per library directory - two
+    flocks on the same file from one process would block each other.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._mutex = threading.RLock()
+        self._fd = None
+        self._depth = 0
+
+    def __enter__(self):
+        self._mutex.acquire()
+        if self._depth == 0:
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                except BaseException:
+                    os.close(fd)
+                    raise
+            except BaseException:
+                self._mutex.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._mutex.release()
+
+
+_library_locks: Dict[Path, LibraryLock] = {}
+
+
+def library_lock(library_dir: Path) -> LibraryLock:
+    path = library_dir.resolve() / LOCK_FILE
+    if path not in _library_locks:
+        _library_locks[path] = LibraryLock(path)
+    return _library_locks[path]
+
+
+def fsync_dir(path: Path):
+    """Make renames and unlinks inside path durable"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # not supported for directories on every platform
+    finally:
+        os.close(fd)
+
+
+_syncfs = None
+
+
+def sync_filesystem(path: Path):
+    """Flush every dirty page of the filesystem holding path in one call
+
+    Used as the single barrier of a group commit: cheaper than an fsync per
+    file when a batch writes hundreds of them. Falls back to a global sync
+    where syncfs(2) is unavailable.
+    """
+    global _syncfs
+    if _syncfs is None:
+        try:
+            import ctypes
+            _syncfs = ctypes.CDLL(None, use_errno=True).syncfs
+        except (OSError, AttributeError):
+            _syncfs = False
+    if not _syncfs:
+        os.sync()
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if _syncfs(fd) != 0:
+            os.sync()
+    finally:
+        os.close(fd)
+
+
+def temp_path(path: Path) -> Path:
+    """Hidden per-process sibling of path, ignored by every store scan"""
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def atomic_write(path: Path, data: bytes):
+    """Write data to a synced temp file and rename it over path
+
+    Readers see either the old or the new content, never a partial file,
+    and the new content survives a crash once this returns.
+    """
+    tmp = temp_path(path)
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    fsync_dir(path.parent)
+
+
+class FileStore:
+    """Default storage layout: one pretty-printed JSON file per prompt"""
+
+    kind = "files"
+
+    def __init__(self, library_dir: Path):
+        self.library_dir = library_dir
+        self.lock = library_lock(library_dir)
+
+    def locked(self):
+        """Hold the library lock around a read-check-write sequence"""
+        return self.lock
+
+    def path(self, name: str) -> Path:
+        return self.library_dir / f"{name}.json"
+
+    def names(self) -> List[str]:
+        """Prompt names from the directory listing alone, without stat calls"""
+        with os.scandir(self.library_dir) as entries:
+            return [
+                entry.name[:-5] for entry in entries
+                if entry.name.endswith(".json") and not entry.name.startswith(".") and entry.is_file()
+            ]
+
+    def scan(self) -> Dict[str, tuple]:
+        """(mtime_ns, size) of every prompt, from stat only"""
+        found = {}
+        with os.scandir(self.library_dir) as entries:
+            for entry in entries:
+                # Dot-files are library metadata (e.g. .serializer.json), never prompts
+                if entry.name.endswith(".json") and not entry.name.startswith(".") and entry.is_file():
+                    st = entry.stat()
+                    found[entry.name[:-5]] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def signature(self, name: str) -> Optional[tuple]:
+        try:
+            st = self.path(name).stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def exists(self, name: str) -> bool:
+        return self.path(name).exists()
+
+    def read(self, name: str) -> bytes:
+        return self.path(name).read_bytes()
+
+    def write(self, name: str, data: bytes):
+        with self.lock:
+            atomic_write(self.path(name), data)
+
+    def write_many(self, items: List[Tuple[str, bytes]]):
+        """Group commit: write every temp file, sync once, then rename them all"""
+        with self.lock:
+            staged = []
+            try:
+                for name, data in items:
+                    path = self.path(name)
+                    staged.append((temp_path(path), path))
+                    staged[-1][0].write_bytes(data)
+                if staged:
+                    sync_filesystem(self.library_dir)
+                for tmp, path in staged:
+                    os.replace(tmp, path)
+            except BaseException:
+                for tmp, _ in staged:
+                    if tmp.exists():
+                        tmp.unlink()
+                raise
+            if staged:
+                fsync_dir(self.library_dir)
+
+    def delete(self, name: str):
+        with self.lock:
+            self.path(name).unlink()
+            fsync_dir(self.library_dir)
+
+    def flush(self):
+        pass
+
+    def reload(self):
+        pass
+
+
+class PackStore:
+    """Packed storage layout: one append-only data file plus an offset table
+
+    Every write appends a record (header, name, JSON payload) to
+    library.pack and every delete appends a tombstone, so existing bytes are
+    never rewritten. library.pack.idx stores the offset of the latest record
+    per prompt; whatever part of the data file it does not cover yet is
+    replayed on open. Reads are slices of an mmap of the data file.
+
+    Appends happen under the library lock; taking it first replays whatever
+    other processes appended since, or reloads after another compaction.
+    Reads keep using the data file that was open when the offsets were
+    read, so they stay consistent without the lock.
+    """
+
+    kind = "packed"
+
+    RECORD = struct.Struct("<4sBHIQ")  # magic, flags, name length, payload length, mtime_ns
+    RECORD_MAGIC = b"PRMT"
+    TOMBSTONE = 1
+    TABLE = struct.Struct("<4sQI")  # magic, data bytes covered, entry count
+    TABLE_MAGIC = b"PIDX"
+    ENTRY = struct.Struct("<QIQH")  # payload offset, payload length, mtime_ns, name length
+
+    # Rewrite the offset table once this many records had to be replayed
+    REPLAY_SAVE_THRESHOLD = 256
+
+    def __init__(self, library_dir: Path):
+        self.library_dir = library_dir
+        self.data_path = library_dir / PACK_FILE
+        self.table_path = library_dir / PACK_INDEX_FILE
+        self.offsets: Dict[str, tuple] = {}  # name -> (offset, length, mtime_ns)
+        self._file = None
+        self._map = None
+        self._end = 0  # data file bytes applied to offsets
+        self._dirty = False
+        self.lock = library_lock(library_dir)
+        with self.lock:
+            self.data_path.touch(exist_ok=True)
+            self._load_table()
+
+    @contextmanager
+    def locked(self):
+        """Hold the library lock, first catching up with other writers"""
+        with self.lock:
+            self._catch_up()
+            yield self
+
+    def _catch_up(self):
+        """Apply what other processes wrote since we last looked"""
+        try:
+            st = self.data_path.stat()
+        except FileNotFoundError:
+            raise RuntimeError("packed library was removed by another process")
+        if st.st_ino != os.fstat(self._file.fileno()).st_ino:
+            self._load_table()
+        elif st.st_size != self._end:
+            self._replay(self._end)
+
+    def _load_table(self):
+        self.close()
+        self._file = open(self.data_path, 'rb')
+        covered = 0
+        self.offsets = {}
+        try:
+            raw = self.table_path.read_bytes()
+            magic, covered, count = self.TABLE.unpack_from(raw, 0)
+            if magic != self.TABLE_MAGIC:
+                raise ValueError("bad offset table")
+            pos = self.TABLE.size
+            for _ in range(count):
+                offset, length, mtime_ns, name_len = self.ENTRY.unpack_from(raw, pos)
+                pos += self.ENTRY.size
+                self.offsets[raw[pos:pos + name_len].decode()] = (offset, length, mtime_ns)
+                pos += name_len
+        except (OSError, ValueError, struct.error):
+            self.offsets = {}
+            covered = 0
+
+        size = os.fstat(self._file.fileno()).st_size
+        if covered > size:
+            # Data file was replaced behind our back - rebuild from scratch
+            self.offsets = {}
+            covered = 0
+        self._end = covered
+        if covered < size and self._replay(covered) >= self.REPLAY_SAVE_THRESHOLD:
+            self.save_table()
+
+    def _replay(self, start: int) -> int:
+        """Apply records from start to the end of the data file"""
+        data = self._mapped(os.fstat(self._file.fileno()).st_size)
+        pos = start
+        replayed = 0
+        while pos + self.RECORD.size <= len(data):
+            magic, flags, name_len, length, mtime_ns = self.RECORD.unpack_from(data, pos)
+            end = pos + self.RECORD.size + name_len + length
+            if magic != self.RECORD_MAGIC or end > len(data):
+                break
+            name = bytes(data[pos + self.RECORD.size:pos + self.RECORD.size + name_len]).decode()
+            if flags & self.TOMBSTONE:
+                self.offsets.pop(name, None)
+            else:
+                self.offsets[name] = (end - length, length, mtime_ns)
+            pos = end
+            replayed += 1
+
+        if pos < len(data):
+            # Torn write from a crash - drop the partial record so appends stay parseable
+            self._unmap()
+            os.truncate(self.data_path, pos)
+        self._end = pos
+        self._dirty = self._dirty or replayed > 0
+        return replayed
+
+    def _mapped(self, end: int = 0):
+        """mmap of the data file, remapped when it has grown past end"""
+        if self._map is None or len(self._map) < end:
+            self._unmap()
+            if os.fstat(self._file.fileno()).st_size == 0:
+                return b""
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _unmap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def close(self):
+        self._unmap()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def save_table(self):
+        """Persist the offset table; callers hold the library lock"""
+        parts = [self.TABLE.pack(self.TABLE_MAGIC, self._end, len(self.offsets))]
+        for name, (offset, length, mtime_ns) in self.offsets.items():
+            encoded = name.encode()
+            parts.append(self.ENTRY.pack(offset, length, mtime_ns, len(encoded)))
+            parts.append(encoded)
+        atomic_write(self.table_path, b"".join(parts))
+        self._dirty = False
+
+    def append_records(self, records: List[Tuple[str, Optional[bytes], int]]):
+        """Append (name, payload, mtime_ns) records with one fsync; a None payload deletes"""
+        chunks = []
+        with self.locked(), open(self.data_path, 'ab') as f:
+            pos = f.seek(0, os.SEEK_END)
+            for name, payload, mtime_ns in records:
+                encoded = name.encode()
+                flags = self.TOMBSTONE if payload is None else 0
+                payload = payload or b""
+                chunks.append(self.RECORD.pack(self.RECORD_MAGIC, flags, len(encoded), len(payload), mtime_ns))
+                chunks.append(encoded)
+                chunks.append(payload)
+                pos += self.RECORD.size + len(encoded) + len(payload)
+                if flags:
+                    self.offsets.pop(name, None)
+                else:
+                    self.offsets[name] = (pos - len(payload), len(payload), mtime_ns)
+            f.write(b"".join(chunks))
+            f.flush()
+            os.fsync(f.fileno())
+            self._end = pos
+        self._dirty = True
+
+    def names(self) -> List[str]:
+        return list(self.offsets)
+
+    def scan(self) -> Dict[str, tuple]:
+        return {name: (mtime_ns, length) for name, (_, length, mtime_ns) in self.offsets.items()}
+
+    def signature(self, name: str) -> Optional[tuple]:
+        entry = self.offsets.get(name)
+        return (entry[2], entry[1]) if entry else None
+
+    def exists(self, name: str) -> bool:
+        return name in self.offsets
+
+    def read(self, name: str) -> bytes:
+        entry = self.offsets.get(name)
+        if entry is None:
+            raise FileNotFoundError(name)
+        offset, length, _ = entry
+        return self._mapped(offset + length)[offset:offset + length]
+
+    def write(self, name: str, data: bytes):
+        self.append_records([(name, data, time.time_ns())])
+
+    def write_many(self, items: List[Tuple[str, bytes]]):
+        now = time.time_ns()
+        with self.locked():
+            self.append_records([(name, data, now) for name, data in items])
+            self.flush()
+
+    def delete(self, name: str):
+        with self.locked():
+            if name not in self.offsets:
+                raise FileNotFoundError(name)
+            self.append_records([(name, None, time.time_ns())])
+
+    def flush(self):
+        with self.locked():
+            if self._dirty:
+                self.save_table()
+
+    def reload(self):
+        """Pick up records other processes wrote since we last looked"""
+        with self.lock:
+            self._catch_up()
+
+    def compact(self) -> int:
+        """Rewrite the data file with only live records; returns bytes reclaimed"""
+        with self.locked():
+            return self._compact()
+
+    def _compact(self) -> int:
+        before = self._end
+        data = self._mapped(before)
+        tmp = temp_path(self.data_path)
+        offsets = {}
+        with open(tmp, 'wb') as f:
+            for name in sorted(self.offsets):
+                offset, length, mtime_ns = self.offsets[name]
+                encoded = name.encode()
+                f.write(self.RECORD.pack(self.RECORD_MAGIC, 0, len(encoded), length, mtime_ns))
+                f.write(encoded)
+                offsets[name] = (f.tell(), length, mtime_ns)
+                f.write(data[offset:offset + length])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.data_path)
+        fsync_dir(self.library_dir)
+        self.close()
+        self._file = open(self.data_path, 'rb')
+        self.offsets = offsets
+        self._end = os.fstat(self._file.fileno()).st_size
+        self.save_table()
+        return before - self._end
+
+
+def open_store(library_dir: Path, backend: Optional[str] = None):
+    """Storage backend for a library; packed if a pack file already exists"""
+    if backend is None:
+        backend = PackStore.kind if (library_dir / PACK_FILE).exists() else FileStore.kind
+    if backend == PackStore.kind:
+        return PackStore(library_dir)
+    if backend == FileStore.kind:
+        return FileStore(library_dir)
+    raise ValueError(f"Unknown library backend '{backend}'")
+
+
+# Full-text query syntax: "exact phrase", field:value, setting>=number, word*
+QUERY_TOKEN = re.compile(
+    r'(?P<field>\w+):(?P<value>"[^"]*"|\S+)'
+    r'|(?P<key>\w+)(?P<op>>=|<=|!=|>|<|=)(?P<number>[-\d.]+)'
+    r'|"(?P<phrase>[^"]*)"'
+    r'|(?P<word>\S+)'
+)
+TEXT_FIELDS = ("name", "category", "tags", "positive", "negative", "notes")
+
+
+def _fts_quote(text: str) -> str:
+    """Quote a term or phrase so FTS5 never interprets it as syntax"""
+    prefix = text.endswith("*")
+    text = text.rstrip("*")
+    quoted = '"' + text.replace('"', '""') + '"'
+    return f"{quoted} *" if prefix else quoted
+
+
+def parse_search_query(query: str) -> Tuple[str, List[str], List]:
+    """Split a search query into an FTS5 MATCH expression and SQL filters
+
+    Bare words and "quoted phrases" are matched against every text field.
+    ``positive:``/``negative:``/``notes:`` restrict a term to one field,
+    ``tag:``/``category:``/``name:``/``sampler:`` filter on metadata and
+    ``cfg>7``/``steps>=30`` compare any numeric setting.
+    """
+    match_terms = []
+    where = []
+    params = []
+
+    for token in QUERY_TOKEN.finditer(query):
+        if token.group("field"):
+            field = token.group("field").lower()
+            value = token.group("value").strip('"')
+            if field in ("positive", "negative", "notes"):
+                match_terms.append(f"{field} : {_fts_quote(value)}")
+            elif field in ("tag", "tags"):
+                where.append("instr(char(31) || search_tags || char(31), char(31) || ? || char(31)) > 0")
+                params.append(value.lower())
+            elif field in ("category", "cat"):
+                where.append("search_category = ?")
+                params.append(value.lower())
+            elif field == "name":
+                where.append("instr(search_name, ?) > 0")
+                params.append(value.lower())
+            else:
+                where.append("instr(lower(CAST(json_extract(settings, ?) AS TEXT)), ?) > 0")
+                params.extend([f'$."{field}"', value.lower()])
+        elif token.group("key"):
+            try:
+                number = float(token.group("number"))
+            except ValueError:
+                raise ValueError(f"Invalid number in '{token.group(0)}'")
+            op = "<>" if token.group("op") == "!=" else token.group("op")
+            where.append(f"CAST(json_extract(settings, ?) AS REAL) {op} ?")
+            params.extend([f'$."{token.group("key").lower()}"', number])
+        elif token.group("phrase") is not None:
+            if token.group("phrase").strip():
+                match_terms.append(_fts_quote(token.group("phrase")))
+        else:
+            match_terms.append(_fts_quote(token.group("word")))
+
+    return " ".join(match_terms), where, params
+
+
+class PromptIndex:
+    """On-disk metadata and full-text index for a prompt library
+
+    Lives next to the prompt files as a small SQLite database so that listing
+    and searching never have to open and parse every prompt JSON. Entries are
+    revalidated against file mtime/size when the index is opened and updated
+    incrementally whenever the library writes or deletes a prompt. Prompt
+    text is kept in an FTS5 table for ranked (BM25) full-text search.
+    """
+
+    SCHEMA_VERSION = 3
+
+    # BM25 column weights, in the order of the prompts_fts columns
+    BM25_WEIGHTS = (10.0, 3.0, 5.0, 1.0, 0.5, 1.0)
+
+    def __init__(self, store, cache: Optional[PromptCache] = None):
+        self.store = store
+        self.cache = cache or PromptCache(0)
+        self.library_dir = store.library_dir
+        try:
+            self.conn = sqlite3.connect(self.library_dir / INDEX_FILE, timeout=10)
+            self._init_schema()
+        except sqlite3.Error:
+            # Read-only or unsupported filesystem - keep the index in memory
+            self.conn = sqlite3.connect(":memory:")
+            self._init_schema()
+        self.refresh()
+
+    def _init_schema(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS prompts")
+            self.conn.execute("DROP TABLE IF EXISTS prompts_fts")
+            self.conn.execute("DROP TABLE IF EXISTS signatures")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS prompts (
+                id INTEGER PRIMARY KEY,
+                file TEXT UNIQUE NOT NULL,
+                name TEXT NOT NULL,
+                category TEXT NOT NULL,
+                tags TEXT NOT NULL,
+                settings TEXT,
+                search_name TEXT NOT NULL,
+                search_category TEXT NOT NULL,
+                search_tags TEXT NOT NULL,
+                valid INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS prompts_fts USING fts5(
+                name, category, tags, positive, negative, notes,
+                tokenize = 'porter unicode61'
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                file TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                minhash BLOB
+            )
+        """)
+        self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def refresh(self):
+        """Re-index files whose mtime or size changed and drop removed ones"""
+        on_disk = self.store.scan()
+        known = {
+            row[0]: (row[1], row[2])
+            for row in self.conn.execute("SELECT file, mtime_ns, size FROM prompts")
+        }
+
+        with self.conn:
+            for name in known.keys() - on_disk.keys():
+                self._delete(name)
+            for name, signature in on_disk.items():
+                if known.get(name) != signature:
+                    self._index_file(name, signature)
+
+    def _delete(self, name: str):
+        # prompts_fts rows share their rowid with prompts.id
+        row = self.conn.execute("SELECT id FROM prompts WHERE file = ?", (name,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM prompts_fts WHERE rowid = ?", row)
+            self.conn.execute("DELETE FROM prompts WHERE id = ?", row)
+
+    def _index_file(self, name: str, signature: tuple):
+        mtime_ns, size = signature
+        self._delete(name)
+        try:
+            prompt = self.cache.get(name, signature)
+            if prompt is None:
+                prompt = ComfyPrompt.from_dict(decode_prompt(self.store.read(name)))
+            tags = [str(t) for t in prompt.tags]
+            settings = json.dumps(prompt.settings) if isinstance(prompt.settings, dict) else None
+            row = (str(prompt.name), str(prompt.category), tags, settings, 1)
+        except Exception:
+            # Keep broken files listable, but never return them from search
+            prompt = None
+            row = (name, "", [], None, 0)
+
+        display_name, category, tags, settings, valid = row
+        cursor = self.conn.execute(
+            "INSERT INTO prompts VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                name, display_name, category, json.dumps(tags), settings,
+                display_name.lower(), category.lower(),
+                "\x1f".join(t.lower() for t in tags),
+                valid, mtime_ns, size,
+            ),
+        )
+        if prompt:
+            self.conn.execute(
+                "INSERT INTO prompts_fts (rowid, name, category, tags, positive, negative, notes) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    cursor.lastrowid, display_name, category, " ".join(tags),
+                    prompt.positive or "", prompt.negative or "", prompt.notes or "",
+                ),
+            )
+
+    def update(self, name: str):
+        """Re-index a single prompt after it was written"""
+        self.update_many([name])
+
+    def update_many(self, names: List[str]):
+        """Re-index several prompts in one transaction"""
+        with self.conn:
+            for name in names:
+                signature = self.store.signature(name)
+                if signature is None:
+                    self._delete(name)
+                else:
+                    self._index_file(name, signature)
+
+    def remove(self, name: str):
+        """Drop a prompt from the index after it was deleted"""
+        with self.conn:
+            self._delete(name)
+
+    def signatures(self, num_perm: int) -> Dict[str, Tuple[tuple, Optional[tuple]]]:
+        """Cached MinHash signatures: name -> ((mtime_ns, size), signature)"""
+        cached = {}
+        for file, mtime_ns, size, blob in self.conn.execute("SELECT * FROM signatures"):
+            if blob is None:
+                cached[file] = ((mtime_ns, size), None)
+            elif len(blob) == num_perm * 8:
+                cached[file] = ((mtime_ns, size), tuple(struct.unpack(f"<{num_perm}Q", blob)))
+        return cached
+
+    def save_signatures(self, fresh: Dict[str, Tuple[tuple, Optional[tuple]]]):
+        """Store newly computed signatures and drop ones for removed prompts"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO signatures VALUES (?, ?, ?, ?)",
+                [
+                    (name, mtime_ns, size, struct.pack(f"<{len(sig)}Q", *sig) if sig else None)
+                    for name, ((mtime_ns, size), sig) in fresh.items()
+                ],
+            )
+            self.conn.execute("DELETE FROM signatures WHERE file NOT IN (SELECT file FROM prompts)")
+
+    def names(self) -> List[str]:
+        """All indexed prompt names, sorted"""
+        return [row[0] for row in self.conn.execute("SELECT file FROM prompts ORDER BY file")]
+
+    def entries(self) -> List[Tuple[str, str, List[str]]]:
+        """(name, category, tags) of every prompt, sorted by name"""
+        rows = self.conn.execute("SELECT file, category, tags FROM prompts ORDER BY file")
+        return [(file, category, json.loads(tags)) for file, category, tags in rows]
+
+    def search(self, query: str) -> List[str]:
+        """Substring match on name, category or any tag (case-insensitive)"""
+        query = query.lower()
+        rows = self.conn.execute(
+            """
+            SELECT file FROM prompts
+            WHERE valid = 1 AND (
+                instr(search_name, ?) > 0 OR
+                instr(search_category, ?) > 0 OR
+                instr(search_tags, ?) > 0
+            )
+            ORDER BY file
+            """,
+            (query, query, query),
+        )
+        return [row[0] for row in rows]
+
+    def full_text_search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Ranked search over prompt text and metadata
+
+        Returns (name, score) pairs, best match first. Scores are BM25 based
+        and only comparable within one query; filter-only queries score 0.
+        """
+        match, where, params = parse_search_query(query)
+        if not match and not where:
+            raise ValueError("Empty search query")
+
+        where = ["p.valid = 1"] + where
+        if match:
+            weights = ", ".join(str(w) for w in self.BM25_WEIGHTS)
+            sql = (
+                f"SELECT p.file, -bm25(prompts_fts, {weights}) AS score "
+                "FROM prompts_fts JOIN prompts p ON p.id = prompts_fts.rowid "
+                f"WHERE prompts_fts MATCH ? AND {' AND '.join(where)} "
+                "ORDER BY score DESC, p.file"
+            )
+            params = [match] + params
+        else:
+            sql = f"SELECT p.file, 0.0 FROM prompts p WHERE {' AND '.join(where)} ORDER BY p.file"
+
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        try:
+            return [(row[0], row[1]) for row in self.conn.execute(sql, params)]
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query: {e}")
+
+
+def iter_json_records(import_file: Path, chunk_size: int = 1 << 20,
+                      max_record: int = IMPORT_MAX_RECORD_SIZE) -> Iterator[Tuple[object, int]]:
+    """Stream records from a JSON array, a single object or JSONL
+
+    Yields (record, position) where position is the number of bytes read
+    from disk so far, so callers can report progress against the file size
+    without knowing the record count. Only one chunk plus the record being
+    decoded is held in memory at a time; a record that has not decoded
+    within max_record characters raises ValueError rather than pulling the
+    rest of the file into memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(import_file, 'r', encoding='utf-8') as f:
+        buf = f.read(chunk_size)
+        read = f.buffer.tell()
+        pos = 0
+        eof = not buf
+
+        def skip(chars: str):
+            nonlocal buf, pos, read, eof
+            while True:
+                while pos < len(buf) and buf[pos] in chars:
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return
+                buf, pos = f.read(chunk_size), 0
+                read = f.buffer.tell()
+                eof = not buf
+
+        skip(" \t\r\n")
+        in_array = pos < len(buf) and buf[pos] == "["
+        if in_array:
+            pos += 1
+        separators = " \t\r\n," if in_array else " \t\r\n"
+
+        while True:
+            skip(separators)
+            if pos >= len(buf):
+                if in_array:
+                    raise ValueError("Unterminated JSON array")
+                return
+            if in_array and buf[pos] == "]":
+                return
+
+            while True:
+                try:
+                    record, end = decoder.raw_decode(buf, pos)
+                    break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    if len(buf) - pos > max_record:
+                        raise ValueError(f"Malformed or oversized record near byte {read}: "
+                                         f"no complete JSON value within {max_record} characters")
+                    # Record spans the chunk boundary - drop what was consumed and read on
+                    more = f.read(chunk_size)
+                    read = f.buffer.tell()
+                    eof = not more
+                    buf, pos = buf[pos:] + more, 0
+
+            pos = end
+            yield record, read
+
+
+def _prepare_import_batch(records: List[object], stamp: str,
+                          serializer: PromptSerializer) -> List[Tuple[str, Optional[dict], object]]:
+    """Validate and serialize a batch of import records (runs in a worker process)
+
+    Returns (name, data, payload) per record; data is None and payload holds
+    the error message for records that are not valid prompts.
+    """
+    prepared = []
+    for record in records:
+        try:
+            if not isinstance(record, dict):
+                raise ValueError("not a JSON object")
+            prompt = ComfyPrompt.from_dict(record)
+            if not isinstance(prompt.name, str) or not prompt.name.strip():
+                raise ValueError("missing name")
+            if "/" in prompt.name or os.sep in prompt.name or prompt.name.startswith("."):
+                raise ValueError(f"invalid name '{prompt.name}'")
+            prompt.created = prompt.created or stamp
+            prompt.modified = stamp
+            data = prompt.to_dict()
+            prepared.append((prompt.name, data, serializer.encode(data)))
+        except Exception as e:
+            name = record.get("name", "?") if isinstance(record, dict) else "?"
+            prepared.append((str(name), None, str(e)))
+    return prepared
+
+
+def render_prompt_txt(prompt: ComfyPrompt) -> str:
+    """Plain-text rendering used by export_txt and txt batch exports"""
+    content = f"""Prompt: {prompt.name}
+Category: {prompt.category}
+Tags: {', '.join(prompt.tags)}
+
+Positive Prompt:
+{prompt.positive}
+
+Negative Prompt:
+{prompt.negative}
+"""
+
+    if prompt.settings:
+        content += f"\nSettings:\n{json.dumps(prompt.settings, indent=2)}\n"
+
+    if prompt.notes:
+        content += f"\nNotes:\n{prompt.notes}\n"
+
+    return content
+
+
+def comfy_sampler(name: Optional[str]) -> Tuple[str, str]:
+    """Map a sampler label like 'DPM++ 2M Karras' to ComfyUI (sampler_name, scheduler)"""
+    label = (name or "euler").strip().lower()
+    scheduler = None
+    if label.endswith(" karras"):
+        label, scheduler = label[:-len(" karras")], "karras"
+    sampler, default_scheduler = COMFY_SAMPLERS.get(
+        label, (label.replace("++", "pp").replace(" ", "_"), "normal")
+    )
+    return sampler, scheduler or default_scheduler
+
+
+def render_prompt_workflow(prompt: ComfyPrompt) -> dict:
+    """ComfyUI API-format txt2img workflow for a prompt"""
+    settings = prompt.settings if isinstance(prompt.settings, dict) else {}
+    sampler, scheduler = comfy_sampler(settings.get("sampler"))
+    return {
+        "3": {
+            "class_type": "KSampler",
+            "inputs": {
+                "seed": settings.get("seed", 0),
+                "steps": settings.get("steps", 20),
+                "cfg": settings.get("cfg", 7.0),
+                "sampler_name": sampler,
+                "scheduler": scheduler,
+                "denoise": settings.get("denoise", 1.0),
+                "model": ["4", 0],
+                "positive": ["6", 0],
+                "negative": ["7", 0],
+                "latent_image": ["5", 0],
+            },
+        },
+        "4": {
+            "class_type": "CheckpointLoaderSimple",
+            "inputs": {"ckpt_name": settings.get("checkpoint", DEFAULT_CHECKPOINT)},
+        },
+        "5": {
+            "class_type": "EmptyLatentImage",
+            "inputs": {
+                "width": settings.get("width", 512),
+                "height": settings.get("height", 512),
+                "batch_size": settings.get("batch_size", 1),
+            },
+        },
+        "6": {"class_type": "CLIPTextEncode", "inputs": {"text": prompt.positive, "clip": ["4", 1]}},
+        "7": {"class_type": "CLIPTextEncode", "inputs": {"text": prompt.negative, "clip": ["4", 1]}},
+        "8": {"class_type": "VAEDecode", "inputs": {"samples": ["3", 0], "vae": ["4", 2]}},
+        "9": {"class_type": "SaveImage", "inputs": {"filename_prefix": prompt.name, "images": ["8", 0]}},
+    }
+
+
+def _render_export_batch(payloads: List[Tuple[str, bytes]], fmt: str) -> List[Tuple[str, Optional[str]]]:
+    """Parse and render a batch of stored prompts (runs in a worker process)
+
+    Returns (name, rendered text) pairs; text is None for unreadable prompts.
+    """
+    rendered = []
+    for name, payload in payloads:
+        try:
+            prompt = ComfyPrompt.from_dict(decode_prompt(payload))
+        except Exception:
+            rendered.append((name, None))
+            continue
+
+        if fmt == "txt":
+            text = render_prompt_txt(prompt)
+        elif fmt == "workflow":
+            text = json.dumps(render_prompt_workflow(prompt), indent=2)
+        elif fmt == "jsonl":
+            text = json.dumps(prompt.to_dict()) + "\n"
+        else:
+            buffer = io.StringIO()
+            row = prompt.to_dict()
+            row["tags"] = ", ".join(str(t) for t in prompt.tags)
+            row["settings"] = json.dumps(prompt.settings) if prompt.settings else ""
+            csv.writer(buffer).writerow([row[column] for column in CSV_COLUMNS])
+            text = buffer.getvalue()
+        rendered.append((name, text))
+    return rendered
+
+
+def prompt_shingles(prompt: ComfyPrompt, size: int = SHINGLE_SIZE) -> set:
+    """Word n-grams of the positive and negative prompt, marked by side"""
+    shingles = set()
+    for marker, text in (("+", prompt.positive), ("-", prompt.negative)):
+        words = re.findall(r"\w+", (text or "").lower())
+        if len(words) < size:
+            shingles.update(f"{marker}{word}" for word in words)
+        else:
+            shingles.update(f"{marker}{' '.join(words[i:i + size])}" for i in range(len(words) - size + 1))
+    return shingles
+
+
+def minhash_signature(shingles: set, num_perm: int = MINHASH_PERMUTATIONS) -> Optional[Tuple[int, ...]]:
+    """One-permutation MinHash with rotation densification
+
+    Each shingle is hashed once and lands in one of num_perm bins, keeping
+    the minimum per bin; empty bins borrow from the next filled bin. This
+    estimates Jaccard similarity like classic MinHash at a fraction of the
+    cost of num_perm hashes per shingle.
+    """
+    if not shingles:
+        return None
+
+    empty = 1 << 64
+    bins = [empty] * num_perm
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "little")
+        slot, value = h % num_perm, h // num_perm
+        if value < bins[slot]:
+            bins[slot] = value
+
+    # Densify: borrow from the nearest filled bin to the right, offset by distance
+    signature = list(bins)
+    for i in range(num_perm):
+        if bins[i] == empty:
+            distance = 1
+            while bins[(i + distance) % num_perm] == empty:
+                distance += 1
+            signature[i] = bins[(i + distance) % num_perm] + distance * DENSIFY_OFFSET
+    return tuple(signature)
+
+
+def pack_signature(signature: Tuple[int, ...]) -> int:
+    """A signature as one int, so two can be compared with a single XOR"""
+    return int.from_bytes(struct.pack(f"<{len(signature)}Q", *signature), "little")
+
+
+def packed_similarity(a: int, b: int, num_perm: int = MINHASH_PERMUTATIONS) -> float:
+    """Estimated Jaccard similarity of two packed signatures
+
+    Equal slots XOR to zero; counting zero 64-bit words runs in C.
+    """
+    return array.array("Q", (a ^ b).to_bytes(num_perm * 8, "little")).count(0) / num_perm
+
+
 class PromptLibrary:
     """Manage prompt library operations"""
 
-    def __init__(self, library_dir: Path = COMFYUI_DIR):
+    def __init__(self, library_dir: Path = COMFYUI_DIR, backend: Optional[str] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE, serializer: Optional[PromptSerializer] = None):
         self.library_dir = library_dir
         self.library_dir.mkdir(parents=True, exist_ok=True)
+        self.serializer = serializer or PromptSerializer.load(self.library_dir)
+        self.cache = PromptCache(cache_size)
+        self.store = open_store(self.library_dir, backend)
+        self._index = None
+
+    @property
+    def index(self) -> PromptIndex:
+        """Metadata/search index, opened (and revalidated) on first use
+
+        Loading a prompt or listing names never needs it, which keeps
+        `view` and `list` from stat-ing every prompt on startup.
+        """
+        if self._index is None:
+            self._index = PromptIndex(self.store, self.cache)
+        return self._index
+
+    def refresh(self):
+        """Pick up changes other processes made since the library was opened"""
+        self.store.reload()
+        if self._index is not None:
+            self._index.refresh()
 
     def list_prompts(self) -> List[str]:
-        """List all prompt files"""
-        return sorted([f.stem for f in self.library_dir.glob("*.json")])
+        """List all prompt names, sorted"""
+        return sorted(self.store.names())
+
+    def list_entries(self) -> List[Tuple[str, str, List[str]]]:
+        """(name, category, tags) of every prompt, without loading any prompt"""
+        return self.index.entries()
 
     def load_prompt(self, name: str) -> Optional[ComfyPrompt]:
         """Load a prompt by name"""
-        prompt_file = self.library_dir / f"{name}.json"
-        if not prompt_file.exists():
+        signature = self.store.signature(name)
+        if signature is None:
             return None
 
+        prompt = self.cache.get(name, signature)
+        if prompt is not None:
+            return prompt
+
         try:
-            with open(prompt_file, 'r') as f:
-                data = json.load(f)
-            return ComfyPrompt.from_dict(data)
+            data = decode_prompt(self.store.read(name))
+            prompt = ComfyPrompt.from_dict(data)
+            self.cache.put(name, signature, prompt)
+            return prompt
         except Exception as e:
             console.print(f"[red]Error loading prompt: {e}[/]")
             return None
 
     def save_prompt(self, prompt: ComfyPrompt, overwrite: bool = False):
-        """Save a prompt to the library"""
-        prompt_file = self.library_dir / f"{prompt.name}.json"
-
-        if prompt_file.exists() and not overwrite:
+        """Save a prompt to the library
+
+        The write is atomic and happens under the library lock. A prompt
+        loaded from the library carries its modified stamp; if the stored
+        copy has changed since, another session saved it in between and the
+        save is refused rather than silently discarding their edit.
+        """
+        if self.store.exists(prompt.name) and not overwrite:
             console.print(f"[yellow]Prompt '{prompt.name}' already exists![/]")
             if not Confirm.ask("Overwrite?"):
                 return False
 
-        # Update timestamps
-        if not prompt.created:
-            prompt.created = datetime.now().isoformat()
-        prompt.modified = datetime.now().isoformat()
-
+        # The prompt may be the cached copy other callers share; if the write
+        # fails its stamps must still match the stored file
+        stamps = (prompt.created, prompt.modified)
+        written = False
         try:
-            with open(prompt_file, 'w') as f:
-                json.dump(prompt.to_dict(), f, indent=2)
+            with self.store.locked():
+                if prompt.modified and self.store.exists(prompt.name):
+                    current = decode_prompt(self.store.read(prompt.name)).get("modified")
+                    if current != prompt.modified:
+                        console.print(f"[red]Prompt '{prompt.name}' was changed by another session "
+                                      f"(modified {current}); reload it and try again[/]")
+                        return False
+
+                # Update timestamps
+                if not prompt.created:
+                    prompt.created = datetime.now().isoformat()
+                prompt.modified = datetime.now().isoformat()
+
+                self.store.write(prompt.name, self.serializer.encode(prompt.to_dict()))
+                written = True
+                self.cache.invalidate(prompt.name)
+                signature = self.store.signature(prompt.name)
+                if signature:
+                    self.cache.put(prompt.name, signature, prompt)
+                self.index.update(prompt.name)
             console.print(f"[green]✓ Saved prompt '{prompt.name}'[/]")
             return True
         except Exception as e:
+            if not written:
+                prompt.created, prompt.modified = stamps
             console.print(f"[red]Error saving prompt: {e}[/]")
             return False
 
     def delete_prompt(self, name: str) -> bool:
         """Delete a prompt"""
-        prompt_file = self.library_dir / f"{name}.json"
-        if not prompt_file.exists():
-            console.print(f"[red]Prompt '{name}' not found![/]")
-            return False
-
         try:
-            prompt_file.unlink()
+            with self.store.locked():
+                if not self.store.exists(name):
+                    console.print(f"[red]Prompt '{name}' not found![/]")
+                    return False
+                self.store.delete(name)
+                self.cache.invalidate(name)
+                self.index.remove(name)
             console.print(f"[green]✓ Deleted prompt '{name}'[/]")
             return True
         except Exception as e:
@@ -128,21 +1425,236 @@ class PromptLibrary:
 
     def search_prompts(self, query: str) -> List[str]:
         """Search prompts by name or tags"""
-        query = query.lower()
-        results = []
+        return self.index.search(query)
+
+    def full_text_search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Ranked search over prompt text, tags and settings (see parse_search_query)"""
+        return self.index.full_text_search(query, limit)
+
+    def pack(self, batch_size: int = IMPORT_BATCH_SIZE) -> int:
+        """Move every per-file prompt into the packed layout
+
+        Payload bytes and modification times are kept exactly, so the
+        metadata index stays valid and unpack restores identical files.
+        Returns the number of prompts packed.
+        """
+        files = FileStore(self.library_dir)
+        with files.locked():
+            pack = self.store if self.store.kind == PackStore.kind else PackStore(self.library_dir)
+            on_disk = sorted(files.scan().items())
+
+            for start in range(0, len(on_disk), batch_size):
+                batch = on_disk[start:start + batch_size]
+                pack.append_records([(name, files.read(name), mtime_ns) for name, (mtime_ns, _) in batch])
+                pack.flush()
+                for name, _ in batch:
+                    files.path(name).unlink()
+            fsync_dir(self.library_dir)
+
+        self.store = pack
+        self._index = None
+        return len(on_disk)
+
+    def unpack(self, batch_size: int = IMPORT_BATCH_SIZE) -> int:
+        """Write every packed prompt back to its own JSON file and drop the pack
+
+        Returns the number of prompts unpacked.
+        """
+        if self.store.kind != PackStore.kind:
+            return 0
+
+        pack = self.store
+        files = FileStore(self.library_dir)
+        with pack.locked():
+            items = list(pack.scan().items())
+            for start in range(0, len(items), batch_size):
+                batch = items[start:start + batch_size]
+                files.write_many([(name, pack.read(name)) for name, _ in batch])
+                for name, (mtime_ns, _) in batch:
+                    os.utime(files.path(name), ns=(mtime_ns, mtime_ns))
+
+            count = len(pack.offsets)
+            pack.close()
+            pack.data_path.unlink()
+            pack.table_path.unlink(missing_ok=True)
+            fsync_dir(self.library_dir)
+        self.store = files
+        self._index = None
+        return count
+
+    def find_duplicates(self, threshold: float = DEDUPE_THRESHOLD) -> List[List[Tuple[str, float]]]:
+        """Clusters of near-identical prompts, found with MinHash + LSH banding
+
+        Signatures are cached in the index per (mtime, size), so only new or
+        edited prompts are re-shingled. Only prompts that share an LSH band
+        are compared, each pair once; in bands shared by more than
+        LSH_MAX_BUCKET distinct signatures each member is compared with a
+        few leaders only, so boilerplate shared by the whole library does
+        not make this quadratic. Each cluster is a list of (name, similarity
+        to the first member); the first member is the oldest prompt, the one
+        merge_duplicates keeps.
+        """
+        signatures = {}
+        fresh = {}
+        cached = self.index.signatures(MINHASH_PERMUTATIONS)
+        for name, signature in self.store.scan().items():
+            entry = cached.get(name)
+            if entry and entry[0] == signature:
+                sig = entry[1]
+            else:
+                prompt = self.load_prompt(name)
+                sig = minhash_signature(prompt_shingles(prompt)) if prompt else None
+                fresh[name] = (signature, sig)
+            if sig:
+                signatures[name] = sig
+        self.index.save_signatures(fresh)
+
+        # LSH: prompts whose signatures agree on a whole band become candidates
+        buckets: Dict[tuple, List[str]] = {}
+        for name, sig in signatures.items():
+            for band in range(LSH_BANDS):
+                chunk = sig[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+                buckets.setdefault((band, chunk), []).append(name)
+
+        parent: Dict[str, str] = {}
+
+        def find(name: str) -> str:
+            while parent.get(name, name) != name:
+                # Path halving: point each visited node at its grandparent
+                parent[name] = parent.get(parent[name], parent[name])
+                name = parent[name]
+            return name
+
+        def union(a: str, b: str):
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_a] = root_b
+
+        packed = {name: pack_signature(sig) for name, sig in signatures.items()}
+
+        # Exact copies share every band: union them once, and let only one
+        # representative per distinct signature into the pairwise stage
+        representative: Dict[int, str] = {}
+        for name, key in packed.items():
+            if key in representative:
+                union(name, representative[key])
+            else:
+                representative[key] = name
+        distinct = set(representative.values())
+
+        compared = set()
+
+        def similar(a: str, b: str) -> bool:
+            """Compare a pair once, however many bands it shares"""
+            pair = (a, b) if a < b else (b, a)
+            if pair in compared:
+                return False
+            compared.add(pair)
+            return packed_similarity(packed[a], packed[b]) >= threshold
 
-        for prompt_name in self.list_prompts():
-            prompt = self.load_prompt(prompt_name)
-            if not prompt:
+        for members in buckets.values():
+            members = sorted(name for name in members if name in distinct)
+            if len(members) < 2:
+                continue
+            if len(members) <= LSH_MAX_BUCKET:
+                for i, a in enumerate(members):
+                    for b in members[i + 1:]:
+                        if find(a) != find(b) and similar(a, b):
+                            union(a, b)
                 continue
 
-            # Search in name, tags, and category
-            if (query in prompt.name.lower() or
-                query in prompt.category.lower() or
-                any(query in tag.lower() for tag in prompt.tags)):
-                results.append(prompt_name)
+            # Too big to compare pairwise: compare each member with a bounded
+            # set of leaders, one per group found so far. A family of variants
+            # still joins its first leader; pairs of unrelated prompts that
+            # merely share boilerplate also meet in smaller buckets.
+            leaders = []
+            for name in members:
+                for leader in leaders:
+                    if find(name) == find(leader):
+                        break
+                    if similar(name, leader):
+                        union(name, leader)
+                        break
+                else:
+                    if len(leaders) < LSH_BUCKET_LEADERS:
+                        leaders.append(name)
 
-        return results
+        clusters: Dict[str, List[str]] = {}
+        for name in list(parent):
+            clusters.setdefault(find(name), []).append(name)
+        for root, members in clusters.items():
+            if root not in members:
+                members.append(root)
+
+        def age(name: str) -> Tuple[str, str]:
+            prompt = self.load_prompt(name)
+            return ((prompt.created if prompt else None) or "", name)
+
+        results = []
+        for members in clusters.values():
+            keeper = min(members, key=age)
+            others = sorted(
+                ((name, packed_similarity(packed[keeper], packed[name])) for name in members if name != keeper),
+                key=lambda item: (-item[1], item[0]),
+            )
+            results.append([(keeper, 1.0)] + others)
+        return sorted(results, key=lambda cluster: (-len(cluster), cluster[0][0]))
+
+    def merge_duplicates(self, names: List[str]) -> Optional[str]:
+        """Fold a duplicate cluster into its first prompt
+
+        names is a cluster from find_duplicates, whose first member is the
+        one shown as kept. The kept prompt gains the other prompts' tags and
+        a note listing what was merged; the others are deleted. Returns the
+        kept name.
+        """
+        keeper = self.load_prompt(names[0]) if names else None
+        others = [p for p in (self.load_prompt(name) for name in names[1:]) if p]
+        if not keeper or not others:
+            return None
+
+        merged = ComfyPrompt.from_dict(dict(keeper.to_dict()))
+        merged.tags = list(keeper.tags)
+        for other in others:
+            merged.tags.extend(tag for tag in other.tags if tag not in merged.tags)
+        note = f"Merged duplicates: {', '.join(p.name for p in others)}"
+        merged.notes = f"{merged.notes}\n{note}" if merged.notes else note
+
+        with console.capture(), self.store.locked():
+            saved = self.save_prompt(merged, overwrite=True)
+            if saved:
+                for other in others:
+                    if other.name != merged.name:
+                        self.delete_prompt(other.name)
+        return merged.name if saved else None
+
+    def reformat(self, serializer: PromptSerializer, batch_size: int = IMPORT_BATCH_SIZE) -> int:
+        """Re-encode every prompt with serializer and make it the library default
+
+        Unreadable prompts are left as they are. A packed library is
+        compacted afterwards. Returns the number of prompts rewritten.
+        """
+        rewritten = 0
+        with self.store.locked():
+            names = sorted(self.store.scan())
+            for start in range(0, len(names), batch_size):
+                batch = []
+                for name in names[start:start + batch_size]:
+                    try:
+                        batch.append((name, serializer.encode(decode_prompt(self.store.read(name)))))
+                    except Exception as e:
+                        console.print(f"[yellow]Skipped unreadable prompt '{name}': {e}[/]")
+                self.store.write_many(batch)
+                for name, _ in batch:
+                    self.cache.invalidate(name)
+                self.index.update_many([name for name, _ in batch])
+                rewritten += len(batch)
+
+            serializer.save(self.library_dir)
+            self.serializer = serializer
+            if self.store.kind == PackStore.kind:
+                self.store.compact()
+        return rewritten
 
     def export_txt(self, name: str, output_file: Path):
         """Export prompt to plain text file"""
@@ -150,50 +1662,453 @@ class PromptLibrary:
         if not prompt:
             return False
 
-        content = f"""Prompt: {prompt.name}
-Category: {prompt.category}
-Tags: {', '.join(prompt.tags)}
+        output_file.write_text(render_prompt_txt(prompt))
+        console.print(f"[green]✓ Exported to {output_file}[/]")
+        return True
 
-Positive Prompt:
-{prompt.positive}
+    def export_many(self, names: List[str], output: Path, fmt: str = "jsonl",
+                    workers: Optional[int] = None, batch_size: int = IMPORT_BATCH_SIZE) -> int:
+        """Export a selection of prompts in one pass
+
+        txt and workflow write one file per prompt into the output directory;
+        jsonl and csv stream into a single buffered file. Prompts are parsed
+        and rendered in a worker pool. Returns the number exported.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+        per_file = fmt in ("txt", "workflow")
+        suffix = ".txt" if fmt == "txt" else ".json"
+        exported = 0
+        failed = []
+
+        if per_file:
+            output.mkdir(parents=True, exist_ok=True)
+            sink = None
+        else:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            sink = open(output, 'w', buffering=1 << 20, newline="")
+            if fmt == "csv":
+                csv.writer(sink).writerow(CSV_COLUMNS)
+
+        def write(rendered: List[Tuple[str, Optional[str]]]):
+            nonlocal exported
+            for name, text in rendered:
+                if text is None:
+                    failed.append(name)
+                elif per_file:
+                    (output / f"{name}{suffix}").write_text(text)
+                    exported += 1
+                else:
+                    sink.write(text)
+                    exported += 1
+
+        def payloads(batch: List[str]) -> List[Tuple[str, bytes]]:
+            return [(name, self.store.read(name)) for name in batch if self.store.exists(name)]
+
+        from concurrent.futures import ProcessPoolExecutor
+        from rich.progress import Progress, BarColumn, TextColumn, TimeElapsedColumn
+
+        batches = [names[i:i + batch_size] for i in range(0, len(names), batch_size)]
+        try:
+            with Progress(
+                TextColumn("[cyan]Exporting[/]"),
+                BarColumn(),
+                TextColumn("{task.completed}/{task.total}"),
+                TimeElapsedColumn(),
+                console=console,
+                transient=True,
+            ) as progress:
+                task = progress.add_task("export", total=len(names))
+                if len(batches) <= 1:
+                    # Not worth starting worker processes
+                    for batch in batches:
+                        write(_render_export_batch(payloads(batch), fmt))
+                        progress.advance(task, len(batch))
+                else:
+                    workers = workers or os.cpu_count() or 1
+                    with ProcessPoolExecutor(max_workers=workers) as pool:
+                        pending = deque()
+                        for batch in batches:
+                            pending.append((pool.submit(_render_export_batch, payloads(batch), fmt), len(batch)))
+                            # Bounded read-ahead keeps memory flat; results are written in order
+                            while len(pending) > workers * 2:
+                                future, count = pending.popleft()
+                                write(future.result())
+                                progress.advance(task, count)
+                        while pending:
+                            future, count = pending.popleft()
+                            write(future.result())
+                            progress.advance(task, count)
+        finally:
+            if sink:
+                sink.close()
+
+        for name in failed[:10]:
+            console.print(f"[yellow]Skipped unreadable prompt '{name}'[/]")
+        return exported
+
+
+    def import_json(self, import_file: Path, on_conflict: str = "skip",
+                    workers: Optional[int] = None, batch_size: int = IMPORT_BATCH_SIZE):
+        """Import prompts from a JSON array, single JSON object or JSONL file
+
+        Records are streamed from disk, validated and serialized in a worker
+        pool and written in batches. Name clashes are resolved without asking
+        according to on_conflict: skip, overwrite or rename (name-2, name-3...).
+        """
+        if on_conflict not in CONFLICT_POLICIES:
+            raise ValueError(f"on_conflict must be one of {', '.join(CONFLICT_POLICIES)}")
+
+        workers = workers or os.cpu_count() or 1
+        stamp = datetime.now().isoformat()
+        existing = set(self.list_prompts())
+        counts = {"imported": 0, "overwritten": 0, "renamed": 0, "skipped": 0, "invalid": 0}
+        errors = []
+
+        def write_batch(prepared: List[Tuple[str, Optional[dict], str]]):
+            # One lock hold and one sync per batch (group commit); names are
+            # re-checked under the lock in case another session added them
+            with self.store.locked():
+                written = []
+                for name, data, payload in prepared:
+                    if data is None:
+                        counts["invalid"] += 1
+                        errors.append(f"{name}: {payload}")
+                        continue
+
+                    if name in existing or self.store.exists(name):
+                        if on_conflict == "skip":
+                            counts["skipped"] += 1
+                            continue
+                        if on_conflict == "rename":
+                            suffix = 2
+                            while f"{name}-{suffix}" in existing or self.store.exists(f"{name}-{suffix}"):
+                                suffix += 1
+                            name = data["name"] = f"{name}-{suffix}"
+                            payload = self.serializer.encode(data)
+                            counts["renamed"] += 1
+                        else:
+                            counts["overwritten"] += 1
+
+                    existing.add(name)
+                    written.append((name, payload))
+                    counts["imported"] += 1
+                self.store.write_many(written)
+                for name, _ in written:
+                    self.cache.invalidate(name)
+                self.index.update_many([name for name, _ in written])
+
+        from concurrent.futures import ProcessPoolExecutor
+        from rich.progress import Progress, BarColumn, TextColumn, TimeElapsedColumn
+
+        total = import_file.stat().st_size
+        pool = None
+        try:
+            with Progress(
+                TextColumn("[cyan]Importing[/]"),
+                BarColumn(),
+                TextColumn("{task.fields[records]} records"),
+                TimeElapsedColumn(),
+                console=console,
+                transient=True,
+            ) as progress:
+                task = progress.add_task("import", total=total, records=0)
+                pending = deque()
+                held = None
+                batch = []
+                seen = 0
+
+                def drain(limit: int):
+                    while len(pending) > limit:
+                        future, position = pending.popleft()
+                        write_batch(future.result())
+                        progress.update(task, completed=position, records=seen)
+
+                def submit(batch: List[object], position: int):
+                    nonlocal pool, held
+                    if pool is None:
+                        # Hold the first batch back: a file that fits in one
+                        # batch is not worth starting worker processes for
+                        if held is None:
+                            held = (batch, position)
+                            return
+                        pool = ProcessPoolExecutor(max_workers=workers)
+                        pending.append((pool.submit(_prepare_import_batch, held[0], stamp, self.serializer), held[1]))
+                    pending.append((pool.submit(_prepare_import_batch, batch, stamp, self.serializer), position))
+                    drain(workers * 2)
+
+                for record, position in iter_json_records(import_file):
+                    batch.append(record)
+                    seen += 1
+                    if len(batch) >= batch_size:
+                        submit(batch, position)
+                        batch = []
+
+                if batch:
+                    submit(batch, total)
+                if pool is None and held:
+                    write_batch(_prepare_import_batch(held[0], stamp, self.serializer))
+                    progress.update(task, completed=total, records=seen)
+                drain(0)
+        except Exception as e:
+            console.print(f"[red]Error importing: {e}[/]")
+            console.print(f"[yellow]{counts['imported']} prompt(s) were imported before the error[/]")
+            return False
+        finally:
+            if pool:
+                pool.shutdown()
+
+        for error in errors[:10]:
+            console.print(f"[yellow]Skipped invalid prompt {error}[/]")
+        if len(errors) > 10:
+            console.print(f"[yellow]... and {len(errors) - 10} more invalid prompt(s)[/]")
+
+        summary = f"[green]✓ Imported {counts['imported']} prompt(s)[/]"
+        details = [
+            f"{counts[key]} {key}" for key in ("overwritten", "renamed", "skipped", "invalid") if counts[key]
+        ]
+        if details:
+            summary += f" [dim]({', '.join(details)})[/]"
+        console.print(summary)
+        return True
 
-Negative Prompt:
-{prompt.negative}
-"""
 
-        if prompt.settings:
-            content += f"\nSettings:\n{json.dumps(prompt.settings, indent=2)}\n"
+def daemon_socket_path(library_dir: Path) -> Path:
+    """Per-user, per-library socket path (short enough for the sun_path limit)"""
+    runtime = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    digest = hashlib.sha1(str(library_dir.resolve()).encode()).hexdigest()[:12]
+    return Path(runtime) / f"prompt-library-{os.getuid()}-{digest}.sock"
 
-        if prompt.notes:
-            content += f"\nNotes:\n{prompt.notes}\n"
 
-        output_file.write_text(content)
-        console.print(f"[green]✓ Exported to {output_file}[/]")
-        return True
+def daemon_request(library_dir: Path, request: dict) -> Optional[dict]:
+    """Send one request to the library daemon; None when none is listening"""
+    path = daemon_socket_path(library_dir)
+    if not path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(DAEMON_TIMEOUT)
+            sock.connect(str(path))
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as reply:
+                return json.loads(reply.readline())
+    except (OSError, ValueError):
+        return None
+
+
+class InotifyWatcher:
+    """Names changed in one directory, from inotify(7) through ctypes
+
+    Raises OSError where inotify is unavailable (not Linux, watch limit
+    reached); callers fall back to polling then.
+    """
+
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    EVENT = struct.Struct("iIII")  # watch descriptor, mask, cookie, name length
+
+    def __init__(self, path: Path):
+        import ctypes
 
-    def import_json(self, import_file: Path):
-        """Import prompts from JSON file"""
         try:
-            with open(import_file, 'r') as f:
-                data = json.load(f)
+            libc = ctypes.CDLL(None, use_errno=True)
+            inotify_init1, inotify_add_watch = libc.inotify_init1, libc.inotify_add_watch
+        except (OSError, AttributeError):
+            raise OSError("inotify is not available on this platform")
+
+        self.fd = inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_DELETE
+        if inotify_add_watch(self.fd, os.fsencode(path), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"cannot watch {path}: {os.strerror(errno)}")
+
+    def read(self) -> Optional[set]:
+        """Names with pending events (never blocks); None if events were lost"""
+        names = set()
+        overflow = False
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos < len(buffer):
+                _, mask, _, length = self.EVENT.unpack_from(buffer, pos)
+                pos += self.EVENT.size
+                if mask & self.IN_Q_OVERFLOW:
+                    overflow = True
+                elif length:
+                    names.add(os.fsdecode(buffer[pos:pos + length].rstrip(b"\0")))
+                pos += length
+        return None if overflow else names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class LibraryDaemon:
+    """Answer list/search/view for one library over a Unix socket
+
+    Keeps a PromptLibrary - the index plus every parsed prompt - loaded
+    and in step with the directory through inotify, or by polling where
+    inotify is unavailable. Each connection carries one JSON request line
+    and gets one JSON reply line. Pending change events are applied before
+    every request, so a client always sees its own earlier writes.
+    """
 
-            # Handle both single prompt and array of prompts
-            prompts_data = data if isinstance(data, list) else [data]
+    def __init__(self, library_dir: Path = COMFYUI_DIR):
+        self.library_dir = library_dir
+        self.socket_path = daemon_socket_path(library_dir)
+        self.watcher = None
+        self.library = self._open()
+
+    def _open(self) -> PromptLibrary:
+        library = PromptLibrary(self.library_dir, cache_size=DAEMON_CACHE_SIZE)
+        library.index  # open and revalidate up front rather than on the first search
+        for name in library.list_prompts()[:DAEMON_CACHE_SIZE]:
+            library.load_prompt(name)
+        return library
+
+    def sync(self, names: Optional[set] = None):
+        """Apply changes to the named files, or rescan everything when None"""
+        if names is not None:
+            names = {name for name in names if not name.startswith(".")}
+            if not names:
+                return
+
+        packed = (self.library_dir / PACK_FILE).exists()
+        try:
+            if packed != (self.library.store.kind == PackStore.kind):
+                # pack/unpack switched the layout under us
+                self.library = self._open()
+            elif packed or names is None:
+                self.library.refresh()
+            else:
+                changed = sorted(name[:-5] for name in names if name.endswith(".json"))
+                if changed:
+                    self.library.index.update_many(changed)
+        except (OSError, RuntimeError, sqlite3.Error) as e:
+            # e.g. the pack disappeared mid-unpack - start over from disk
+            console.print(f"[yellow]Reloading library: {e}[/]")
+            self.library = self._open()
+
+    def handle(self, request: dict):
+        op = request.get("op")
+        if op == "ping":
+            return "pong"
+        if op == "list":
+            query = request.get("search")
+            return self.library.search_prompts(query) if query else self.library.list_prompts()
+        if op == "search":
+            return self.library.full_text_search(request["query"], request.get("limit"))
+        if op == "view":
+            prompt = self.library.load_prompt(request["name"])
+            return prompt.to_dict() if prompt else None
+        raise ValueError(f"unknown request '{op}'")
+
+    def _serve_client(self, conn: socket.socket):
+        with conn:
+            conn.settimeout(DAEMON_TIMEOUT)
+            try:
+                if self.watcher:
+                    self.sync(self.watcher.read())
+                with conn.makefile("rb") as stream:
+                    request = json.loads(stream.readline())
+                reply = {"ok": True, "result": self.handle(request)}
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+            try:
+                conn.sendall(json.dumps(reply).encode() + b"\n")
+            except OSError:
+                pass
+
+    def serve_forever(self):
+        if daemon_request(self.library_dir, {"op": "ping"}) is not None:
+            raise RuntimeError(f"a daemon is already serving {self.library_dir}")
+        self.socket_path.unlink(missing_ok=True)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o077)
+        try:
+            server.bind(str(self.socket_path))
+        finally:
+            os.umask(umask)
+        server.listen(16)
 
-            imported = 0
-            for prompt_data in prompts_data:
-                try:
-                    prompt = ComfyPrompt.from_dict(prompt_data)
-                    if self.save_prompt(prompt):
-                        imported += 1
-                except Exception as e:
-                    console.print(f"[yellow]Skipped invalid prompt: {e}[/]")
+        try:
+            self.watcher = InotifyWatcher(self.library_dir)
+        except OSError as e:
+            console.print(f"[yellow]{e} - polling every {DAEMON_POLL_INTERVAL:.0f}s instead[/]")
+
+        selector = selectors.DefaultSelector()
+        selector.register(server, selectors.EVENT_READ, "client")
+        if self.watcher:
+            selector.register(self.watcher.fd, selectors.EVENT_READ, "watch")
+        # Let `kill` clean up the socket like Ctrl+C does
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+        console.print(f"[green]✓ Serving {len(self.library.list_prompts())} prompt(s) "
+                      f"from {self.library_dir} on {self.socket_path}[/]")
+        next_poll = time.monotonic() + DAEMON_POLL_INTERVAL
+        try:
+            while True:
+                for key, _ in selector.select(None if self.watcher else DAEMON_POLL_INTERVAL):
+                    if key.data == "watch":
+                        self.sync(self.watcher.read())
+                    else:
+                        self._serve_client(server.accept()[0])
+                if not self.watcher and time.monotonic() >= next_poll:
+                    self.sync()
+                    next_poll = time.monotonic() + DAEMON_POLL_INTERVAL
+        finally:
+            selector.close()
+            server.close()
+            self.socket_path.unlink(missing_ok=True)
+            if self.watcher:
+                self.watcher.close()
+
+
+class RemoteLibrary:
+    """Read-only stand-in for PromptLibrary that asks a running daemon"""
+
+    def __init__(self, library_dir: Path):
+        self.library_dir = library_dir
 
-            console.print(f"[green]✓ Imported {imported} prompt(s)[/]")
-            return True
-        except Exception as e:
-            console.print(f"[red]Error importing: {e}[/]")
-            return False
+    @classmethod
+    def connect(cls, library_dir: Path) -> Optional["RemoteLibrary"]:
+        """A client for the library's daemon, or None if it is not running"""
+        reply = daemon_request(library_dir, {"op": "ping"})
+        return cls(library_dir) if reply and reply.get("ok") else None
+
+    def _call(self, op: str, **params):
+        reply = daemon_request(self.library_dir, {"op": op, **params})
+        if reply is None:
+            raise ConnectionError("prompt library daemon stopped responding")
+        if not reply["ok"]:
+            raise ValueError(reply["error"])
+        return reply["result"]
+
+    def list_prompts(self) -> List[str]:
+        return self._call("list")
+
+    def search_prompts(self, query: str) -> List[str]:
+        return self._call("list", search=query)
+
+    def full_text_search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        return [tuple(item) for item in self._call("search", query=query, limit=limit)]
+
+    def load_prompt(self, name: str) -> Optional[ComfyPrompt]:
+        data = self._call("view", name=name)
+        return ComfyPrompt.from_dict(data) if data else None
 
 
 def display_prompt(prompt: ComfyPrompt):
@@ -215,6 +2130,8 @@ def display_prompt(prompt: ComfyPrompt):
 
     # Settings
     if prompt.settings:
+        from rich.syntax import Syntax
+
         console.print("\n[bold yellow]Settings:[/]")
         settings_text = json.dumps(prompt.settings, indent=2)
         console.print(Syntax(settings_text, "json", theme="monokai"))
@@ -227,9 +2144,212 @@ def display_prompt(prompt: ComfyPrompt):
     console.print()
 
 
-def browse_prompts_tui():
-    """Interactive TUI for browsing prompts"""
-    library = PromptLibrary()
+class FuzzyFilter:
+    """Incremental fuzzy matcher over prompt names, categories and tags
+
+    A prompt that fuzzy-matches "abc" also matches "ab", so every keystroke
+    only re-checks the candidates left by the previous query, and Backspace
+    pops back to the cached candidates of the shorter query.
+    """
+
+    def __init__(self, entries: List[Tuple[str, str, List[str]]]):
+        self.names = [name for name, _, _ in entries]
+        self._names_lc = [name.lower() for name in self.names]
+        self._keys = [
+            f"{name} {category} {' '.join(tags)}".lower()
+            for name, category, tags in entries
+        ]
+        self._stack: List[Tuple[str, List[int]]] = [("", list(range(len(entries))))]
+        self._ranked: Optional[List[str]] = None
+
+    @property
+    def query(self) -> str:
+        return self._stack[-1][0]
+
+    def push(self, char: str):
+        """Narrow the current candidates by one more query character"""
+        query = self.query + char.lower()
+        pattern = re.compile(".*?".join(map(re.escape, query)))
+        keys = self._keys
+        candidates = [i for i in self._stack[-1][1] if pattern.search(keys[i])]
+        self._stack.append((query, candidates))
+        self._ranked = None
+
+    def pop(self):
+        """Undo the last character, reusing the cached candidates"""
+        if len(self._stack) > 1:
+            self._stack.pop()
+            self._ranked = None
+
+    def results(self) -> List[str]:
+        """Current matches, best first"""
+        if self._ranked is None:
+            query, candidates = self._stack[-1]
+            if not query:
+                self._ranked = [self.names[i] for i in candidates]
+            else:
+                pattern = re.compile(".*?".join(map(re.escape, query)))
+                candidates = sorted(candidates, key=lambda i: self._rank(i, query, pattern))
+                self._ranked = [self.names[i] for i in candidates]
+        return self._ranked
+
+    def _rank(self, idx: int, query: str, pattern) -> tuple:
+        """Sort key: name substring > fuzzy name match > category/tag match, then tightness"""
+        name = self._names_lc[idx]
+        pos = name.find(query)
+        if pos == 0:
+            return (0, len(name), 0, name)
+        if pos > 0:
+            return (1, pos, len(name), name)
+        match = pattern.search(name)
+        if match:
+            return (2, match.end() - match.start(), match.start(), name)
+        match = pattern.search(self._keys[idx])
+        return (3, match.end() - match.start(), match.start(), name)
+
+
+# Clipboard tools in order of preference: X11, Wayland, macOS
+CLIPBOARD_COMMANDS = (
+    ("xclip", ["xclip", "-selection", "clipboard"]),
+    ("wl-copy", ["wl-copy"]),
+    ("pbcopy", ["pbcopy"]),
+)
+
+
+class Clipboard:
+    """Clipboard writer shared by the whole session
+
+    The backend is detected once with shutil.which. Copies are handed to a
+    background thread so the caller returns immediately; when no tool is
+    installed the text is sent to the terminal as an OSC 52 escape, which
+    most modern terminals (and SSH sessions) turn into a clipboard write.
+    """
+
+    def __init__(self):
+        self.command = None
+        for tool, command in CLIPBOARD_COMMANDS:
+            if shutil.which(tool):
+                self.command = command
+                break
+        self.last_error: Optional[str] = None
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def backend(self) -> str:
+        return self.command[0] if self.command else "terminal (OSC 52)"
+
+    def copy(self, text: str):
+        """Queue text for the clipboard and return without waiting"""
+        if self.command is None:
+            payload = base64.b64encode(text.encode()).decode()
+            console.file.write(f"\033]52;c;{payload}\a")
+            console.file.flush()
+            return
+
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="clipboard", daemon=True)
+            self._worker.start()
+        self._queue.put(text)
+
+    def _run(self):
+        while True:
+            text = self._queue.get()
+            try:
+                subprocess.run(self.command, input=text.encode(), check=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+            finally:
+                self._queue.task_done()
+
+    def wait(self):
+        """Block until queued copies are done (before the process exits)"""
+        if self._worker is not None:
+            self._queue.join()
+
+
+_clipboard: Optional[Clipboard] = None
+
+
+def get_clipboard() -> Clipboard:
+    """Session-wide clipboard, detected on first use"""
+    global _clipboard
+    if _clipboard is None:
+        _clipboard = Clipboard()
+    return _clipboard
+
+
+def clipboard_text(prompt: ComfyPrompt, part: str = "positive") -> str:
+    """Text to copy for a prompt: positive, negative or both"""
+    if part == "negative":
+        return prompt.negative
+    if part == "both":
+        # Same layout as SD WebUI generation info, so it pastes back in there too
+        return f"{prompt.positive}\nNegative prompt: {prompt.negative}"
+    return prompt.positive
+
+
+# Header panel, spacer, position/status line and key help around the list
+BROWSER_CHROME_LINES = 7
+
+
+def render_browser(prompts: List[str], selected: int, top: int, height: int, status: str = "",
+                   filter_query: Optional[str] = None, typing: bool = False):
+    """Render only the visible window of the prompt list"""
+    lines = []
+    for idx in range(top, min(top + height, len(prompts))):
+        if idx == selected:
+            lines.append(Text(f"  ▶ {prompts[idx]}", style="bold green", no_wrap=True, overflow="ellipsis"))
+        else:
+            lines.append(Text(f"    {prompts[idx]}", style="dim", no_wrap=True, overflow="ellipsis"))
+    # Pad short lists so the footer does not jump around
+    lines.extend(Text("") for _ in range(height - len(lines)))
+
+    position = Text(f"  {min(selected + 1, len(prompts))}/{len(prompts)}", style="cyan")
+    if filter_query is not None:
+        position.append("  /", style="bold yellow")
+        position.append(filter_query, style="bold yellow")
+        if typing:
+            position.append("█", style="yellow")
+    if status:
+        position.append("  ")
+        position.append_text(Text.from_markup(status))
+
+    if typing:
+        help_text = (
+            "[dim]Filter: type to narrow • [cyan]↑/↓[/] move • [cyan]Backspace[/] undo • "
+            "[cyan]Enter[/] keep filter • [cyan]Esc[/] clear[/]"
+        )
+    else:
+        help_text = (
+            "[dim][cyan]↑↓/jk[/] move • [cyan]PgUp/PgDn[/] page • [cyan]/[/] filter • [cyan]Enter[/] view • "
+            "[cyan]c/n/b[/] copy • [cyan]e[/] export • [cyan]d[/] delete • [red]q[/] quit[/]"
+        )
+
+    from rich.console import Group
+
+    return Group(
+        Panel.fit("[bold cyan]📚 Prompt Library Browser[/]", style="cyan"),
+        Text(""),
+        *lines,
+        position,
+        Text.from_markup(help_text, overflow="ellipsis", justify="left", end=""),
+    )
+
+
+def browse_prompts_tui(library: Optional[PromptLibrary] = None):
+    """Interactive TUI for browsing prompts
+
+    Only the rows that fit on screen are rendered, inside a rich Live
+    display on the alternate screen, so a keypress costs the same with ten
+    prompts or fifty thousand.
+    """
+    import readchar
+    from rich.live import Live
+
+    library = library or PromptLibrary()
     prompts = library.list_prompts()
 
     if not prompts:
@@ -237,82 +2357,126 @@ def browse_prompts_tui():
         console.print("Create your first prompt with: [cyan]prompt-lib add[/]")
         return
 
+    all_prompts = prompts
+    fuzzy = None  # FuzzyFilter while a '/' filter is active
+    typing = False
     selected = 0
+    top = 0
+    status = ""
 
-    while True:
-        console.clear()
-        console.print(Panel.fit("[bold cyan]📚 Prompt Library Browser[/]", style="cyan"))
-        console.print()
+    with Live(console=console, screen=True, auto_refresh=False, transient=True) as live:
+        while True:
+            height = max(console.size.height - BROWSER_CHROME_LINES, 1)
+            top = max(min(top, selected), selected - height + 1)
+            live.update(render_browser(
+                prompts, selected, top, height, status,
+                filter_query=fuzzy.query if fuzzy else None, typing=typing,
+            ), refresh=True)
+
+            key = readchar.readkey()
+            status = ""
+            if _clipboard and _clipboard.last_error:
+                status = f"[red]Error copying: {escape(_clipboard.last_error)}[/]"
+                _clipboard.last_error = None
+
+            # Filter-as-you-type
+            if typing and key not in (readchar.key.UP, readchar.key.DOWN,
+                                      readchar.key.PAGE_UP, readchar.key.PAGE_DOWN):
+                if key.startswith(readchar.key.ESC):
+                    if len(key) > 2:
+                        # Left, Right, Home, End, Delete... - nothing to do while typing
+                        continue
+                    # readchar returns a lone Esc together with the next key
+                    fuzzy, typing, prompts = None, False, all_prompts
+                elif key == readchar.key.ENTER or key == '\r' or key == '\n':
+                    typing = False
+                elif key == readchar.key.BACKSPACE or key == '\x08':
+                    fuzzy.pop()
+                    prompts = fuzzy.results()
+                elif len(key) == 1 and key.isprintable():
+                    fuzzy.push(key)
+                    prompts = fuzzy.results()
+                selected = 0
+                continue
+            if key == '/':
+                if fuzzy is None:
+                    fuzzy = FuzzyFilter(library.list_entries())
+                typing = True
+                continue
+            if key.startswith(readchar.key.ESC) and len(key) <= 2 and fuzzy:
+                fuzzy, prompts, selected = None, all_prompts, 0
+                continue
+            if key.lower() == 'q':
+                break
+            if not prompts:
+                continue
 
-        # Display prompt list
-        for idx, name in enumerate(prompts):
-            if idx == selected:
-                console.print(f"  [bold green]▶ {name}[/]")
-            else:
-                console.print(f"  [dim]  {name}[/]")
-
-        console.print()
-        console.print("[dim]Navigation: [cyan]↑/k[/] up • [cyan]↓/j[/] down • [cyan]Enter[/] view • [cyan]c[/] copy • [cyan]e[/] export • [cyan]d[/] delete • [red]q[/] quit[/]")
-
-        key = readchar.readkey()
-
-        # Navigation
-        if key == readchar.key.UP or key.lower() == 'k':
-            selected = (selected - 1) % len(prompts)
-        elif key == readchar.key.DOWN or key.lower() == 'j':
-            selected = (selected + 1) % len(prompts)
-        elif key == readchar.key.ENTER or key == '\r' or key == '\n':
-            # View prompt
-            prompt = library.load_prompt(prompts[selected])
-            if prompt:
-                console.clear()
-                display_prompt(prompt)
-                Prompt.ask("\n[dim]Press Enter to continue[/]")
-        elif key.lower() == 'c':
-            # Copy to clipboard
-            prompt = library.load_prompt(prompts[selected])
-            if prompt:
-                try:
-                    # Try xclip first, then wl-copy (Wayland), then pbcopy (macOS)
-                    clipboard_cmd = None
-                    if subprocess.run(["which", "xclip"], capture_output=True).returncode == 0:
-                        clipboard_cmd = ["xclip", "-selection", "clipboard"]
-                    elif subprocess.run(["which", "wl-copy"], capture_output=True).returncode == 0:
-                        clipboard_cmd = ["wl-copy"]
-                    elif subprocess.run(["which", "pbcopy"], capture_output=True).returncode == 0:
-                        clipboard_cmd = ["pbcopy"]
-
-                    if clipboard_cmd:
-                        subprocess.run(clipboard_cmd, input=prompt.positive.encode(), check=True)
-                        console.print(f"[green]✓ Copied '{prompts[selected]}' to clipboard[/]")
-                    else:
-                        console.print("[yellow]⚠ No clipboard tool found (install xclip or wl-clipboard)[/]")
-                except Exception as e:
-                    console.print(f"[red]Error copying: {e}[/]")
-                import time
-                time.sleep(1)
-        elif key.lower() == 'e':
-            # Export prompt
-            prompt = library.load_prompt(prompts[selected])
-            if prompt:
+            # Navigation
+            if key == readchar.key.UP or key.lower() == 'k':
+                selected = (selected - 1) % len(prompts)
+            elif key == readchar.key.DOWN or key.lower() == 'j':
+                selected = (selected + 1) % len(prompts)
+            elif key == readchar.key.PAGE_UP:
+                selected = max(selected - height, 0)
+            elif key == readchar.key.PAGE_DOWN:
+                selected = min(selected + height, len(prompts) - 1)
+            elif key == readchar.key.HOME or key == 'g':
+                selected = 0
+            elif key == readchar.key.END or key == 'G':
+                selected = len(prompts) - 1
+            elif key == readchar.key.ENTER or key == '\r' or key == '\n':
+                # View prompt
+                prompt = library.load_prompt(prompts[selected])
+                if prompt:
+                    live.stop()
+                    console.clear()
+                    display_prompt(prompt)
+                    Prompt.ask("\n[dim]Press Enter to continue[/]")
+                    live.start()
+            elif key in ('c', 'n', 'b'):
+                # Copy positive (c), negative (n) or both (b) to the clipboard
+                prompt = library.load_prompt(prompts[selected])
+                if prompt:
+                    part = {'c': "positive", 'n': "negative", 'b': "both"}[key]
+                    clipboard = get_clipboard()
+                    clipboard.copy(clipboard_text(prompt, part))
+                    status = f"[green]✓ Copied {part} of '{escape(prompts[selected])}' ({clipboard.backend})[/]"
+            elif key.lower() == 'e':
+                # Export prompt
                 output_file = Path.home() / f"{prompts[selected]}.txt"
-                library.export_txt(prompts[selected], output_file)
-                import time
-                time.sleep(1)
-        elif key.lower() == 'd':
-            # Delete prompt
-            console.print()
-            if Confirm.ask(f"[yellow]Delete '{prompts[selected]}'?[/]"):
-                if library.delete_prompt(prompts[selected]):
-                    prompts = library.list_prompts()
-                    if not prompts:
-                        break
-                    selected = min(selected, len(prompts) - 1)
-        elif key.lower() == 'q':
-            break
-
-
-def create_prompt_interactive():
+                with console.capture():
+                    exported = library.export_txt(prompts[selected], output_file)
+                if exported:
+                    status = f"[green]✓ Exported to {escape(str(output_file))}[/]"
+                else:
+                    status = f"[red]Could not export '{escape(prompts[selected])}'[/]"
+            elif key.lower() == 'd':
+                # Delete prompt
+                live.stop()
+                console.print()
+                if Confirm.ask(f"[yellow]Delete '{escape(prompts[selected])}'?[/]"):
+                    with console.capture():
+                        deleted = library.delete_prompt(prompts[selected])
+                    if deleted:
+                        status = f"[green]✓ Deleted prompt '{escape(prompts[selected])}'[/]"
+                        all_prompts = prompts = library.list_prompts()
+                        if not prompts:
+                            break
+                        if fuzzy:
+                            # Re-run the active filter against the updated library
+                            query = fuzzy.query
+                            fuzzy = FuzzyFilter(library.list_entries())
+                            for char in query:
+                                fuzzy.push(char)
+                            prompts = fuzzy.results()
+                        selected = max(min(selected, len(prompts) - 1), 0)
+                live.start()
+
+    if _clipboard:
+        _clipboard.wait()
+
+
+def create_prompt_interactive(library: Optional[PromptLibrary] = None):
     """Interactive prompt creation"""
     console.clear()
     console.print(Panel.fit("[bold cyan]✨ Create New Prompt[/]", style="cyan"))
@@ -372,10 +2536,151 @@ def create_prompt_interactive():
         notes=notes if notes else None
     )
 
-    library = PromptLibrary()
+    library = library or PromptLibrary()
     library.save_prompt(prompt)
 
 
+def _bench_records(count: int) -> List[dict]:
+    """Synthetic prompt dicts, parsed from JSON like real library files"""
+    vocabulary = ["portrait", "anime", "landscape", "photorealistic", "cyberpunk",
+                  "fantasy", "product", "illustration", "neon", "cinematic"]
+    records = [
+        {
+            "name": f"bench-{i}",
+            "positive": f"detailed scene {i}, soft lighting, high quality, 4k",
+            "negative": "blurry, low quality, bad anatomy",
+            "tags": [vocabulary[(i + k) % len(vocabulary)] for k in range(4)],
+            "category": vocabulary[i % 4],
+            "settings": {"steps": 30, "cfg": 7.5, "sampler": "DPM++ 2M Karras"},
+            "notes": None,
+            "created": "2026-01-01T00:00:00",
+            "modified": "2026-01-01T00:00:00",
+        }
+        for i in range(count)
+    ]
+    # Round-trip through JSON so every string is a separate object, as after json.load
+    return json.loads(json.dumps(records))
+
+
+def _best_time(func, repeat: int = 3) -> float:
+    """Fastest of several runs, with the GC paused so it does not skew one side"""
+    import gc
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return min(times)
+
+
+def bench_model(count: int) -> List[Tuple[str, str, str, str]]:
+    """Memory and to_dict/from_dict throughput of ComfyPrompt vs the old dataclass"""
+    import tracemalloc
+
+    @dataclass
+    class LegacyPrompt:
+        name: str
+        positive: str
+        negative: str
+        tags: List[str]
+        category: str
+        settings: Optional[Dict] = None
+        notes: Optional[str] = None
+        created: Optional[str] = None
+        modified: Optional[str] = None
+
+        def to_dict(self):
+            return asdict(self)
+
+        @classmethod
+        def from_dict(cls, data: dict):
+            return cls(**data)
+
+    rows = []
+    results = {}
+    for label, cls in (("dataclass (old)", LegacyPrompt), ("slotted (current)", ComfyPrompt)):
+        # Trace from parsing onwards, then drop the source dicts, so the
+        # figure is everything the prompt objects keep alive (incl. strings)
+        tracemalloc.start()
+        records = _bench_records(count)
+        prompts = [cls.from_dict(r) for r in records]
+        del records
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        dicts = [p.to_dict() for p in prompts]
+        to_dict_rate = count / _best_time(lambda: [p.to_dict() for p in prompts])
+        from_dict_rate = count / _best_time(lambda: [cls.from_dict(d) for d in dicts])
+
+        results[label] = (memory / count, to_dict_rate, from_dict_rate)
+        rows.append((label, f"{memory / count:.0f} B", f"{to_dict_rate:,.0f}/s", f"{from_dict_rate:,.0f}/s"))
+
+    old, new = results["dataclass (old)"], results["slotted (current)"]
+    rows.append((
+        "gain",
+        f"{new[0] - old[0]:+.0f} B ({(new[0] / old[0] - 1) * 100:+.0f}%)",
+        f"{new[1] / old[1]:.1f}x",
+        f"{new[2] / old[2]:.1f}x",
+    ))
+    return rows
+
+
+def bench_serializers(count: int) -> List[Tuple[str, str, str, str, str]]:
+    """Encode/decode throughput and stored size of each serializer mode"""
+    modes = [PromptSerializer("json"), PromptSerializer("json", compact=True)]
+    if orjson is not None:
+        modes += [PromptSerializer("orjson"), PromptSerializer("orjson", compact=True)]
+    modes.append(PromptSerializer("auto", compact=True, compression="gzip"))
+    if _zstd() is not None:
+        modes.append(PromptSerializer("auto", compact=True, compression="zstd"))
+
+    records = [ComfyPrompt.from_dict(r).to_dict() for r in _bench_records(count)]
+    rows = []
+    baseline = None
+    for serializer in modes:
+        # Decode the way the library would for files written in this mode
+        parse = decode_prompt if serializer.uses_orjson else (lambda blob: json.loads(_decompress(blob)))
+        blobs = [serializer.encode(r) for r in records]
+        size = sum(len(b) for b in blobs) / count
+        baseline = baseline or size
+        save_rate = count / _best_time(lambda: [serializer.encode(r) for r in records])
+        load_rate = count / _best_time(lambda: [parse(b) for b in blobs])
+        rows.append((serializer.describe(), f"{save_rate:,.0f}/s", f"{load_rate:,.0f}/s",
+                     f"{size:.0f} B", f"{size / baseline * 100:.0f}%"))
+    return rows
+
+
+def run_benchmarks(count: int):
+    """Print the prompt model and serializer benchmarks"""
+    from rich.table import Table
+    from rich import box
+
+    table = Table(title=f"ComfyPrompt ({count:,} prompts)", box=box.ROUNDED)
+    table.add_column("Representation", style="cyan")
+    table.add_column("Memory / prompt", justify="right")
+    table.add_column("to_dict", justify="right")
+    table.add_column("from_dict", justify="right")
+    for row in bench_model(count):
+        table.add_row(*row)
+    console.print(table)
+
+    table = Table(title=f"Serializers ({count:,} prompts, in memory)", box=box.ROUNDED)
+    table.add_column("Mode", style="cyan")
+    table.add_column("Save", justify="right")
+    table.add_column("Load", justify="right")
+    table.add_column("Size / prompt", justify="right")
+    table.add_column("vs pretty json", justify="right")
+    for row in bench_serializers(count):
+        table.add_row(*row)
+    console.print(table)
+
+
 def main():
     """Main CLI entry point"""
     import argparse
@@ -393,18 +2698,61 @@ def main():
     list_parser = subparsers.add_parser("list", help="List all prompts")
     list_parser.add_argument("--search", "-s", help="Search prompts")
 
+    # Search command
+    search_parser = subparsers.add_parser("search", help="Full-text search (prompt text, tags, settings)")
+    search_parser.add_argument("query", nargs="+", help='Terms, "phrases", field:value, setting>number')
+    search_parser.add_argument("--limit", "-n", type=int, default=50, help="Maximum results (default: 50)")
+
     # View command
     view_parser = subparsers.add_parser("view", help="View a prompt")
     view_parser.add_argument("name", help="Prompt name")
 
     # Export command
-    export_parser = subparsers.add_parser("export", help="Export prompt to file")
-    export_parser.add_argument("name", help="Prompt name")
-    export_parser.add_argument("output", help="Output file path")
+    export_parser = subparsers.add_parser("export", help="Export prompt(s) to file")
+    export_parser.add_argument("name", nargs="?", help="Prompt name (omit with --all/--search/--tag)")
+    export_parser.add_argument("output", help="Output file, or directory for txt/workflow batch exports")
+    export_parser.add_argument("--all", action="store_true", help="Export every prompt")
+    export_parser.add_argument("--search", help="Export the results of a full-text search query")
+    export_parser.add_argument("--tag", help="Export prompts with this tag")
+    export_parser.add_argument("--format", "-f", choices=EXPORT_FORMATS,
+                               help="Batch format (default: from output extension, else txt)")
+    export_parser.add_argument("--workers", "-j", type=int, help="Render worker processes (default: CPU count)")
 
     # Import command
     import_parser = subparsers.add_parser("import", help="Import prompts from JSON")
-    import_parser.add_argument("file", help="JSON file to import")
+    import_parser.add_argument("file", help="JSON array, JSON object or JSONL file to import")
+    import_parser.add_argument("--on-conflict", choices=CONFLICT_POLICIES, default="skip",
+                               help="What to do when a prompt name already exists (default: skip)")
+    import_parser.add_argument("--workers", "-j", type=int, help="Validation worker processes (default: CPU count)")
+
+    # Dedupe command
+    dedupe_parser = subparsers.add_parser("dedupe", help="Find (and optionally merge) near-duplicate prompts")
+    dedupe_parser.add_argument("--threshold", "-t", type=float, default=DEDUPE_THRESHOLD,
+                               help=f"Minimum estimated similarity 0-1 (default: {DEDUPE_THRESHOLD})")
+    dedupe_parser.add_argument("--merge", action="store_true", help="Merge each cluster into its oldest prompt")
+    dedupe_parser.add_argument("--yes", "-y", action="store_true", help="Merge without asking per cluster")
+
+    # Storage layout commands
+    subparsers.add_parser("pack", help="Convert the library to the single-file packed layout")
+    subparsers.add_parser("unpack", help="Convert a packed library back to one JSON file per prompt")
+    subparsers.add_parser("compact", help="Reclaim space from updated/deleted prompts in a packed library")
+
+    # Reformat command
+    reformat_parser = subparsers.add_parser("reformat", help="Re-encode every prompt (JSON backend, style, compression)")
+    reformat_parser.add_argument("--backend", choices=SERIALIZER_BACKENDS, default="auto",
+                                 help="JSON library (default: auto - orjson when installed)")
+    style_group = reformat_parser.add_mutually_exclusive_group()
+    style_group.add_argument("--compact", action="store_true", help="No indentation")
+    style_group.add_argument("--pretty", action="store_true", help="Indented, human-editable JSON (default)")
+    reformat_parser.add_argument("--compress", choices=COMPRESSIONS, default="none",
+                                 help="Compress prompt files, e.g. for archive libraries (default: none)")
+
+    # Serve command
+    subparsers.add_parser("serve", help="Keep the library loaded and answer list/search/view for other commands")
+
+    # Benchmark command
+    bench_parser = subparsers.add_parser("bench", help="Benchmark prompt representation and serializers")
+    bench_parser.add_argument("--count", "-n", type=int, default=100_000, help="Synthetic prompts (default: 100000)")
 
     # Delete command
     delete_parser = subparsers.add_parser("delete", help="Delete a prompt")
@@ -412,13 +2760,19 @@ def main():
 
     args = parser.parse_args()
 
-    library = PromptLibrary()
+    if args.command == "serve":
+        LibraryDaemon(COMFYUI_DIR).serve_forever()
+        return
+
+    # Read-only commands are answered by `serve` when it is running
+    library = RemoteLibrary.connect(COMFYUI_DIR) if args.command in DAEMON_COMMANDS else None
+    library = library or PromptLibrary()
 
     if args.command == "browse" or args.command is None:
-        browse_prompts_tui()
+        browse_prompts_tui(library)
 
     elif args.command == "add":
-        create_prompt_interactive()
+        create_prompt_interactive(library)
 
     elif args.command == "list":
         if args.search:
@@ -429,8 +2783,25 @@ def main():
             console.print("[cyan]All prompts:[/]")
 
         if prompts:
-            for name in prompts:
-                console.print(f"  • {name}")
+            # One plain write instead of a rich render per line; names are
+            # printed verbatim, never interpreted as markup
+            console.file.write("".join(f"  • {name}\n" for name in prompts))
+            console.file.flush()
+        else:
+            console.print("[yellow]No prompts found[/]")
+
+    elif args.command == "search":
+        query = " ".join(args.query)
+        try:
+            results = library.full_text_search(query, args.limit)
+        except ValueError as e:
+            console.print(f"[red]{e}[/]")
+            return
+
+        console.print(f"[cyan]Search results for '{query}':[/]")
+        if results:
+            for name, score in results:
+                console.print(f"  • {name} [dim]({score:.2f})[/]")
         else:
             console.print("[yellow]No prompts found[/]")
 
@@ -442,17 +2813,96 @@ def main():
             console.print(f"[red]Prompt '{args.name}' not found![/]")
 
     elif args.command == "export":
-        library.export_txt(args.name, Path(args.output))
+        output = Path(args.output).expanduser()
+        if not (args.all or args.search or args.tag):
+            if not args.name:
+                console.print("[red]Give a prompt name, or select prompts with --all/--search/--tag[/]")
+                return
+            library.export_txt(args.name, output)
+            return
+
+        if args.name:
+            console.print("[red]A prompt name cannot be combined with --all/--search/--tag[/]")
+            return
+
+        if args.all:
+            names = library.list_prompts()
+        else:
+            query = " ".join(filter(None, [args.search, f'tag:"{args.tag}"' if args.tag else None]))
+            try:
+                names = [name for name, _ in library.full_text_search(query)]
+            except ValueError as e:
+                console.print(f"[red]{e}[/]")
+                return
+
+        fmt = args.format or {".jsonl": "jsonl", ".csv": "csv"}.get(output.suffix.lower(), "txt")
+        count = library.export_many(names, output, fmt, workers=args.workers)
+        console.print(f"[green]✓ Exported {count} prompt(s) as {fmt} to {output}[/]")
 
     elif args.command == "import":
-        library.import_json(Path(args.file))
+        library.import_json(Path(args.file), on_conflict=args.on_conflict, workers=args.workers)
+
+    elif args.command == "dedupe":
+        from rich.table import Table
+        from rich import box
+
+        clusters = library.find_duplicates(args.threshold)
+        if not clusters:
+            console.print(f"[green]✓ No near-duplicates above {args.threshold:.0%} similarity[/]")
+            return
+
+        for number, cluster in enumerate(clusters, 1):
+            table = Table(title=f"Cluster {number}", box=box.ROUNDED, title_justify="left")
+            table.add_column("Prompt", style="cyan")
+            table.add_column("Similarity", justify="right")
+            for name, similarity in cluster:
+                table.add_row(name, "keep" if similarity == 1.0 and name == cluster[0][0] else f"{similarity:.0%}")
+            console.print(table)
+
+            if args.merge and (args.yes or Confirm.ask(f"Merge cluster {number}?")):
+                kept = library.merge_duplicates([name for name, _ in cluster])
+                if kept:
+                    console.print(f"[green]✓ Merged {len(cluster) - 1} prompt(s) into '{kept}'[/]")
+
+        console.print(f"[cyan]{len(clusters)} cluster(s), {sum(len(c) - 1 for c in clusters)} duplicate prompt(s)[/]")
+
+    elif args.command == "pack":
+        count = library.pack()
+        console.print(f"[green]✓ Packed {count} prompt(s) into {library.library_dir / PACK_FILE}[/]")
+
+    elif args.command == "unpack":
+        if library.store.kind != PackStore.kind:
+            console.print("[yellow]Library is not packed[/]")
+        else:
+            count = library.unpack()
+            console.print(f"[green]✓ Unpacked {count} prompt(s) to {library.library_dir}[/]")
+
+    elif args.command == "compact":
+        if library.store.kind != PackStore.kind:
+            console.print("[yellow]Only packed libraries need compacting[/]")
+        else:
+            reclaimed = library.store.compact()
+            console.print(f"[green]✓ Compacted library, reclaimed {reclaimed / 1024:.1f} KB[/]")
+
+    elif args.command == "reformat":
+        try:
+            serializer = PromptSerializer(args.backend, compact=args.compact, compression=args.compress)
+        except ValueError as e:
+            console.print(f"[red]{e}[/]")
+            return
+        count = library.reformat(serializer)
+        console.print(f"[green]✓ Rewrote {count} prompt(s) as {serializer.describe()}[/]")
+
+    elif args.command == "bench":
+        run_benchmarks(args.count)
 
     elif args.command == "delete":
         if Confirm.ask(f"[yellow]Delete '{args.name}'?[/]"):
             library.delete_prompt(args.name)
 
 
-if __name__ == "__main__":
+def cli():
+    """Run the CLI with its interrupt and error handling"""
     try:
         main()
     except KeyboardInterrupt:
@@ -461,3 +2911,7 @@ if __name__ == "__main__":
     except Exception as e:
         console.print(f"\n[red]Error: {e}[/]")
         sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,90 @@
+"""Tests for scripts/ai-hub-tui.py"""
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "ai-hub-tui.py"
+
+
+@pytest.fixture(scope="module")
+def hub():
+    spec = importlib.util.spec_from_file_location("ai_hub_tui", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["ai_hub_tui"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def copies(hub, tmp_path, monkeypatch):
+    """The same model in the hub's models dir and in another tool's folder"""
+    models = tmp_path / "models"
+    other = tmp_path / "webui" / "checkpoints"
+    (models / "checkpoints").mkdir(parents=True)
+    other.mkdir(parents=True)
+    monkeypatch.setattr(hub, "MODELS_DIR", models)
+
+    data = os.urandom(hub.DEDUP_MIN_SIZE)
+    for folder in (models / "checkpoints", other):
+        (folder / "model.safetensors").write_bytes(data)
+    return models / "checkpoints" / "model.safetensors", other / "model.safetensors"
+
+
+def test_consolidate_links_unchanged_duplicates(hub, copies):
+    kept, duplicate = copies
+    groups = hub.find_duplicates([kept.parent, duplicate.parent])
+    assert [group.files for group in groups] == [sorted(copies)]
+
+    reclaimed, errors = hub.consolidate_duplicates(groups, mode="hardlink")
+    assert (reclaimed, errors) == (hub.DEDUP_MIN_SIZE, [])
+    assert duplicate.stat().st_ino == kept.stat().st_ino
+
+
+def test_consolidate_skips_files_rewritten_at_the_same_size(hub, copies):
+    kept, duplicate = copies
+    groups = hub.find_duplicates([kept.parent, duplicate.parent])
+
+    # A re-saved fine-tune: same size, new contents
+    rewritten = os.urandom(hub.DEDUP_MIN_SIZE)
+    duplicate.write_bytes(rewritten)
+    st = duplicate.stat()
+    os.utime(duplicate, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    reclaimed, _ = hub.consolidate_duplicates(groups, mode="hardlink")
+    assert reclaimed == 0
+    assert duplicate.read_bytes() == rewritten
+
+
+def test_full_hash_keeps_cached_files_cached(hub, tmp_path):
+    import hashlib
+
+    path = tmp_path / "model.safetensors"
+    data = os.urandom(2 * hub.HASH_CHUNK_SIZE)
+    path.write_bytes(data)
+
+    def cached() -> float:
+        with open(path, "rb") as f:
+            resident = hub.resident_pages(f.fileno(), len(data))
+        if resident is None or not hasattr(os, "posix_fadvise"):
+            pytest.skip("page cache residency is not available")
+        return 1 - resident.count(0) / len(resident)
+
+    # Hot: another process has the model loaded
+    path.read_bytes()
+    if cached() < 1:
+        pytest.skip("file did not stay in the page cache")
+    assert hub.full_hash(path) == hashlib.sha256(data).hexdigest()
+    assert cached() == 1
+
+    # Cold: hashing it must not leave it cached
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    if cached() > 0:
+        pytest.skip("page cache cannot be dropped on this filesystem")
+    hub.full_hash(path)
+    assert cached() == 0
@@ -0,0 +1,171 @@
+"""Tests for scripts/prompt-library.py"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "prompt-library.py"
+
+
+@pytest.fixture(scope="module")
+def prompt_library():
+    spec = importlib.util.spec_from_file_location("prompt_library", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["prompt_library"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def chained_prompts(count: int, length: int = 60):
+    """Prompts that each differ by one word from the previous one"""
+    words = [f"word{i}" for i in range(length)]
+    for i in range(count):
+        words[i * 7 % length] = f"edit{i}"
+        yield " ".join(words)
+
+
+def test_dedupe_chains_through_buckets(prompt_library, tmp_path):
+    library = prompt_library.PromptLibrary(tmp_path)
+    for i, positive in enumerate(chained_prompts(6)):
+        library.save_prompt(prompt_library.ComfyPrompt(f"p{i}", positive, "", [], "test"))
+    library.save_prompt(prompt_library.ComfyPrompt("other", "a completely unrelated prompt about boats", "", [], "test"))
+
+    for threshold in (0.2, 0.8):
+        clusters = library.find_duplicates(threshold)
+        assert [sorted(name for name, _ in cluster) for cluster in clusters] == [[f"p{i}" for i in range(6)]]
+        assert clusters[0][0] == ("p0", 1.0)
+
+
+def test_dedupe_collapses_exact_copies_in_oversized_buckets(prompt_library, tmp_path):
+    library = prompt_library.PromptLibrary(tmp_path)
+    copies = prompt_library.LSH_MAX_BUCKET + 10
+    for i in range(copies):
+        library.save_prompt(prompt_library.ComfyPrompt(f"copy{i:03}", "the same prompt every time", "", [], "test"))
+
+    clusters = library.find_duplicates()
+    assert len(clusters) == 1 and len(clusters[0]) == copies
+
+
+def test_packed_similarity(prompt_library):
+    a = tuple(range(128))
+    b = a[:96] + tuple(range(1000, 1032))
+    pack = prompt_library.pack_signature
+    assert prompt_library.packed_similarity(pack(a), pack(a)) == 1.0
+    assert prompt_library.packed_similarity(pack(a), pack(b)) == 0.75
+
+
+def test_dedupe_merges_existing_clusters(prompt_library, tmp_path, monkeypatch):
+    # n1-n2 and n3-n4 pair up in their own bands, then band 1 joins the two
+    # pairs, which leaves a parent chain two links deep
+    def signature(*bands):
+        slots = [hash((name, band)) & 0xFFFF for band in range(prompt_library.LSH_BANDS)]
+        for band, value in bands:
+            slots[band] = value
+        return tuple(v for v in slots for _ in range(prompt_library.LSH_ROWS))
+
+    library = prompt_library.PromptLibrary(tmp_path)
+    signatures = {}
+    for name, bands in {
+        "n1": [(0, 1)],
+        "n2": [(0, 1), (1, 2)],
+        "n3": [(2, 3)],
+        "n4": [(1, 2), (2, 3)],
+    }.items():
+        signatures[name] = signature(*bands)
+        library.save_prompt(prompt_library.ComfyPrompt(name, name, "", [], "test"))
+
+    scan = library.store.scan
+    monkeypatch.setattr(library.store, "scan", lambda: dict(sorted(scan().items())))
+    monkeypatch.setattr(prompt_library, "prompt_shingles", lambda prompt: prompt.positive)
+    monkeypatch.setattr(prompt_library, "minhash_signature", lambda name: signatures[name])
+    clusters = library.find_duplicates(0.05)
+    assert [sorted(name for name, _ in cluster) for cluster in clusters] == [["n1", "n2", "n3", "n4"]]
+
+
+def test_failed_save_keeps_stamps(prompt_library, tmp_path, monkeypatch):
+    library = prompt_library.PromptLibrary(tmp_path)
+    library.save_prompt(prompt_library.ComfyPrompt("p", "a castle", "", [], "test"))
+    prompt = library.load_prompt("p")
+    stamps = (prompt.created, prompt.modified)
+
+    def fail(name, data):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(library.store, "write", fail)
+        assert not library.save_prompt(prompt, overwrite=True)
+    assert (prompt.created, prompt.modified) == stamps
+
+    prompt.positive = "a castle at night"
+    assert library.save_prompt(prompt, overwrite=True)
+
+
+def test_import_progress_counts_bytes(prompt_library, tmp_path):
+    records = [{"name": f"p{i}", "positive": "château, café " * 50, "negative": ""} for i in range(200)]
+    source = tmp_path / "import.jsonl"
+    source.write_text("\n".join(json.dumps(record, ensure_ascii=False) for record in records), encoding="utf-8")
+
+    positions = [position for _, position in prompt_library.iter_json_records(source, chunk_size=4096)]
+    assert len(positions) == len(records)
+    assert positions == sorted(positions)
+    assert positions[-1] == source.stat().st_size
+
+
+@pytest.mark.parametrize("batch_size, pooled", [(500, False), (16, True)])
+def test_import_in_process_and_pooled(prompt_library, tmp_path, monkeypatch, batch_size, pooled):
+    import concurrent.futures
+
+    pools = []
+    executor = concurrent.futures.ProcessPoolExecutor
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", lambda **kw: pools.append(kw) or executor(**kw))
+
+    source = tmp_path / "import.json"
+    records = [{"name": f"p{i}", "positive": f"prompt {i}", "negative": "", "tags": [], "category": "test"}
+               for i in range(40)]
+    source.write_text(json.dumps(records))
+    library = prompt_library.PromptLibrary(tmp_path / "library")
+
+    assert library.import_json(source, workers=2, batch_size=batch_size)
+    assert len(library.list_prompts()) == 40
+    assert bool(pools) == pooled
+
+
+def test_dedupe_finds_large_families(prompt_library, tmp_path):
+    library = prompt_library.PromptLibrary(tmp_path)
+    base = " ".join(f"word{i}" for i in range(40))
+    variants = prompt_library.LSH_MAX_BUCKET + 36
+    for i in range(variants):
+        library.save_prompt(prompt_library.ComfyPrompt(f"v{i:03}", f"{base} token{i}", "", [], "test"))
+
+    clusters = library.find_duplicates()
+    assert [len(cluster) for cluster in clusters] == [variants]
+
+
+def test_merge_keeps_the_prompt_shown_as_kept(prompt_library, tmp_path):
+    library = prompt_library.PromptLibrary(tmp_path)
+    base = " ".join(f"word{i}" for i in range(40))
+    # Oldest last alphabetically, so the keeper is not simply the first name
+    for name, created in (("c", "2024-01-01T00:00:00"), ("a", "2025-01-01T00:00:00"), ("b", "2025-06-01T00:00:00")):
+        library.save_prompt(prompt_library.ComfyPrompt(name, f"{base} {name}", "", ["tag-" + name], "test",
+                                                       created=created))
+
+    [cluster] = library.find_duplicates()
+    shown = cluster[0][0]
+    assert shown == "c"
+    assert library.merge_duplicates([name for name, _ in cluster]) == shown
+    assert library.list_prompts() == [shown]
+    assert sorted(library.load_prompt(shown).tags) == ["tag-a", "tag-b", "tag-c"]
+
+
+def test_import_stops_at_malformed_record(prompt_library, tmp_path):
+    source = tmp_path / "import.jsonl"
+    good = json.dumps({"name": "p", "positive": "a castle", "negative": ""})
+    source.write_text(good + "\n" + '{"name": "broken", ' + "\n".join([good] * 2000))
+
+    records = prompt_library.iter_json_records(source, chunk_size=1024, max_record=8192)
+    assert next(records)[0]["name"] == "p"
+    with pytest.raises(ValueError, match="oversized record"):
+        next(records)